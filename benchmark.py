@@ -0,0 +1,112 @@
+import os
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# What a cold start has to import, from a bare interpreter to a game and
+# strategy picked through the registry.
+STARTUPS = [('python', 'pass'),
+            ('game_view', 'import game_view'),
+            ('game_view, subtract square + minimax memoize',
+             "import game_view, registry; registry.load_game('s'); "
+             "registry.load_strategy('mm')"),
+            ('game_view, tippy + minimax myopic',
+             "import game_view, registry; registry.load_game('t'); "
+             "registry.load_strategy('mpy')"),
+            ('engine', 'import engine')]
+
+
+def startup_time(code, runs=5):
+    """(str, int) -> float
+
+    Return the median number of seconds, over runs fresh interpreters
+    started in this directory, taken to start up and run code.
+    """
+
+    # One run first, so that every timed run finds the files cached.
+    subprocess.check_call([sys.executable, '-c', code], cwd=HERE)
+    times = []
+    for i in range(runs):
+        start = time.time()
+        subprocess.check_call([sys.executable, '-c', code], cwd=HERE)
+        times.append(time.time() - start)
+    return sorted(times)[runs // 2]
+
+
+def search_time(strategy, state):
+    """(Strategy, GameState) -> float
+
+    Return the number of seconds strategy takes to suggest a move for
+    state.
+    """
+
+    start = time.time()
+    strategy.suggest_move(state)
+    return time.time() - start
+
+
+def search_benchmarks():
+    """() -> list of (str, Strategy, GameState)
+
+    Return the searches to time, each with a description.
+    """
+
+    from registry import load_game, load_strategy
+    subtract, tippy = load_game('s'), load_game('t')
+    return [('subtract square 41, minimax memoize',
+             load_strategy('mm')(state_holder={}),
+             subtract('p1', current_total=41)),
+            ('subtract square 10**4 + 2, minimax myopic 2',
+             load_strategy('mpy')(2),
+             subtract('p1', current_total=10 ** 4 + 2)),
+            ('tippy 3x3, minimax prune', load_strategy('mp')(),
+             tippy('p1', n=3)),
+            ('tippy 4x4, minimax myopic 3', load_strategy('mpy')(3),
+             tippy('p1', n=4)),
+            ('tippy 4x4, minimax myopic 5', load_strategy('mpy')(5),
+             tippy('p1', n=4))]
+
+
+def perft_benchmarks():
+    """() -> list of (str, GameState, int)
+
+    Return the move enumerations to time, each with a description and a
+    depth: fixed trees whose sizes never change, so their times measure
+    possible_next_moves and apply_move alone.
+    """
+
+    from registry import load_game
+    subtract, tippy = load_game('s'), load_game('t')
+    return [('subtract square 10**4, 3 moves',
+             subtract('p1', current_total=10 ** 4), 3),
+            ('tippy 3x3, whole game', tippy('p1', n=3), 9),
+            ('tippy 5x5, 3 moves', tippy('p1', n=5), 3)]
+
+
+def perft_time(state, depth):
+    """(GameState, int) -> (float, int, int)
+
+    Return the number of seconds tree_size.perft takes to count depth
+    moves from state, and the sequences and positions it counts at the
+    last depth.
+    """
+
+    from tree_size import perft
+    start = time.time()
+    paths, positions = perft(state, depth)[-1]
+    return time.time() - start, paths, positions
+
+
+if __name__ == '__main__':
+    for description, code in STARTUPS:
+        print('startup  {:<50} {:8.1f} ms'.format(
+            description, startup_time(code) * 1000))
+    for description, strategy, state in search_benchmarks():
+        print('search   {:<50} {:8.1f} ms'.format(
+            description, search_time(strategy, state) * 1000))
+    for description, state, depth in perft_benchmarks():
+        seconds, paths, positions = perft_time(state, depth)
+        print('perft    {:<50} {:8.1f} ms  {} lines {} positions'.format(
+            description, seconds * 1000, paths, positions))
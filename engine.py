@@ -0,0 +1,390 @@
+import os
+import sys
+import threading
+import time
+from opening_book import OpeningBook, BOOK_PATH
+from registry import STRATEGIES, load_game, load_strategy
+from search_control import SearchCancelled, SearchControl, fallback_move
+
+
+class Engine:
+    """ A long-running engine speaking a line protocol in the spirit of UCI.
+
+    A front end writes one command per line to the engine's input, and
+    reads the engine's replies from its output:
+
+        uci                          -> id lines, then uciok
+        isready                      -> readyok
+        ucinewgame                   -- forget everything learned so far
+        setoption name N value V     -- N is Strategy (r, m, mm, mp, mpy),
+                                        Depth (an int) or OwnBook (true
+                                        or false)
+        position tippy N [moves M..] -- a Tippy game on an N x N board
+        position subtract T [moves M..]
+                                     -- a Subtract Square game from total T
+        go [depth D] [movetime MS]   -> info lines, then bestmove M
+        go [depth D] multipv K       -> an info line for each of the K
+                                        best moves, then bestmove M
+        d                            -> the current position
+        quit
+
+    Moves are written as 'x,y' for Tippy and as the amount removed for
+    Subtract Square.  The player to move first is always p1.
+
+    Unless OwnBook is false, positions found in the opening book at
+    BOOK_PATH are answered from the book without searching.
+
+    The strategy, the starting positions built for each game, the book
+    and any table the strategy keeps survive from one command to the
+    next, so nothing is rebuilt between moves of a game.
+    """
+
+    # registry letter of each game, by the name used in position commands
+    games = {'tippy': 't', 'subtract': 's'}
+
+    def __init__(self, infile=sys.stdin, outfile=sys.stdout):
+        """(Engine, file, file) -> NoneType
+
+        Initialize self to read commands from infile and write replies to
+        outfile, searching with the Minimax Myopic strategy by default.
+
+        >>> engine = Engine()
+        >>> engine.strategy_name, engine.depth
+        ('mpy', 6)
+        """
+
+        self.infile, self.outfile = infile, outfile
+        self.strategy_name, self.depth = 'mpy', 6
+        self.strategy = None
+        self.roots = {}
+        self.state = None
+        self.own_book, self.book = True, None
+
+    def __repr__(self):
+        """(Engine) -> str
+
+        Return a string representation of self.
+
+        >>> Engine()
+        Engine('mpy', 6)
+        """
+
+        return 'Engine({}, {})'.format(repr(self.strategy_name),
+                                       repr(self.depth))
+
+    def send(self, line):
+        """(Engine, str) -> NoneType
+
+        Write line to the front end immediately.
+        """
+
+        self.outfile.write(line + '\n')
+        self.outfile.flush()
+
+    def run(self):
+        """(Engine) -> NoneType
+
+        Answer commands until quit is received or the input ends.
+
+        >>> from io import StringIO
+        >>> script = StringIO('setoption name OwnBook value false\\n'
+        ...                   'position subtract 27\\ngo depth 2\\n'
+        ...                   'position subtract 25\\ngo depth 2\\nquit\\n')
+        >>> out = StringIO()
+        >>> Engine(script, out).run()
+        >>> print(out.getvalue()) # doctest: +ELLIPSIS
+        info depth 1 nodes ... score 1.0 time ... pv 25
+        info depth 2 nodes ... score 1.0 time ... pv 25
+        bestmove 25
+        info string forced
+        bestmove 25
+        <BLANKLINE>
+        """
+
+        for line in self.infile:
+            words = line.split()
+            if not words:
+                continue
+            if words[0] == 'quit':
+                break
+            self.handle(words[0], words[1:])
+
+    def handle(self, command, args):
+        """(Engine, str, list of str) -> NoneType
+
+        Carry out command with arguments args.
+        """
+
+        if command == 'uci':
+            self.send('id name Game Center')
+            self.send('id author Nana Nosirova, Humair Khan')
+            self.send('option name Strategy type combo default mpy ' +
+                      ' '.join('var ' + s for s in sorted(STRATEGIES)))
+            self.send('option name Depth type spin default 6 min 1')
+            self.send('option name OwnBook type check default true')
+            self.send('uciok')
+        elif command == 'isready':
+            self.send('readyok')
+        elif command == 'ucinewgame':
+            self.strategy, self.state = None, None
+        elif command == 'setoption':
+            self.set_option(args)
+        elif command == 'position':
+            self.set_position(args)
+        elif command == 'go':
+            self.go(args)
+        elif command == 'd':
+            self.send(str(self.state))
+        else:
+            self.send('info string unknown command {}'.format(command))
+
+    def set_option(self, args):
+        """(Engine, list of str) -> NoneType
+
+        Change the option named in args, of the form name N value V.
+
+        >>> engine = Engine()
+        >>> engine.set_option(['name', 'Strategy', 'value', 'mm'])
+        >>> engine.set_option(['name', 'Depth', 'value', '4'])
+        >>> engine
+        Engine('mm', 4)
+        """
+
+        if len(args) != 4 or args[0] != 'name' or args[2] != 'value':
+            self.send('info string expected: setoption name N value V')
+        elif args[1] == 'Strategy' and args[3] in STRATEGIES:
+            self.strategy_name, self.strategy = args[3], None
+        elif args[1] == 'Depth' and args[3].isdigit() and int(args[3]) > 0:
+            self.depth = int(args[3])
+        elif args[1] == 'OwnBook' and args[3] in ('true', 'false'):
+            self.own_book = args[3] == 'true'
+        else:
+            self.send('info string bad option {} {}'.format(args[1], args[3]))
+
+    def root(self, game, size):
+        """(Engine, str, int) -> GameState
+
+        Return the starting position of game with size size, building it
+        only the first time it is asked for.
+
+        >>> engine = Engine()
+        >>> engine.root('tippy', 3) is engine.root('tippy', 3)
+        True
+        """
+
+        if (game, size) not in self.roots:
+            state = load_game(self.games[game])
+            if game == 'tippy':
+                self.roots[(game, size)] = state('p1', n=size)
+            else:
+                self.roots[(game, size)] = state('p1', current_total=size)
+        return self.roots[(game, size)]
+
+    def set_position(self, args):
+        """(Engine, list of str) -> NoneType
+
+        Set the current position to the one described by args.
+
+        >>> engine = Engine()
+        >>> engine.set_position(['tippy', '3', 'moves', '1,1', '0,0'])
+        >>> engine.state.board
+        [['p2', None, None], [None, 'p1', None], [None, None, None]]
+        >>> engine.outfile = __import__('io').StringIO()
+        >>> engine.set_position(['tippy', '3', '1,1'])
+        >>> print(engine.outfile.getvalue().strip())
+        info string expected: position tippy|subtract N [moves M ...]
+        """
+
+        self.state = None
+        if (len(args) < 2 or args[0] not in self.games or
+                not args[1].isdigit() or
+                (args[0] == 'tippy' and int(args[1]) < 3) or
+                (len(args) > 2 and args[2] != 'moves')):
+            self.send('info string expected: position tippy|subtract N '
+                      '[moves M ...]')
+            return
+        state = self.root(args[0], int(args[1]))
+        for text in args[3:]:
+            try:
+                new_state = state.apply_move(state.parse_move(text))
+            except ValueError:
+                new_state = None
+            if new_state is None:
+                self.send('info string illegal move {}'.format(text))
+                return
+            state = new_state
+        self.state = state
+
+    def go(self, args):
+        """(Engine, list of str) -> NoneType
+
+        Search the current position and report the best move, within the
+        depth and movetime limits in args.
+
+        A lone tactical move, such as a win in one, is played at once.
+        With the Minimax Myopic strategy the search deepens one move at
+        a time, reporting an info line after each depth, and stops once
+        the next depth is not expected to finish within movetime.  Other
+        strategies search once, as they do in GameView, reporting the
+        positions searched at most once a second.  Any search still going
+        when movetime is up is cancelled, and the best move it found is
+        played, or failing that the fallback_move of the position.
+
+        >>> engine = Engine()
+        >>> engine.outfile = __import__('io').StringIO()
+        >>> engine.set_position(['tippy', '3', 'moves', '1,1', '0,0',
+        ...                      '1,2', '0,1'])
+        >>> engine.go(['depth', '3'])
+        >>> engine.outfile.getvalue().split('\\n')[-2]
+        'bestmove 2,1'
+        >>> engine.go(['depth', 'x'])
+        >>> engine.outfile.getvalue().split('\\n')[-2]
+        'info string expected: go [depth D] [movetime MS] [multipv K], \
+with D and K at least 1'
+        >>> engine.set_option(['name', 'Strategy', 'value', 'm'])
+        >>> engine.set_position(['tippy', '5'])
+        >>> engine.go(['movetime', '100'])
+        >>> engine.outfile.getvalue().split('\\n')[-3:-1]
+        ['info string stopped at movetime', 'bestmove 2,2']
+        """
+
+        options = dict(zip(args[::2], args[1::2]))
+        if (len(args) % 2 or
+                any(name not in ('depth', 'movetime', 'multipv') or
+                    not value.isdigit() for name, value in options.items())
+                or int(options.get('depth', 1)) < 1
+                or int(options.get('multipv', 1)) < 1):
+            self.send('info string expected: go [depth D] [movetime MS] '
+                      '[multipv K], with D and K at least 1')
+            return
+        depth = int(options.get('depth', self.depth))
+        movetime = int(options.get('movetime', 0)) / 1000
+        if self.state is None:
+            self.send('info string no position')
+            return
+        if not self.state.possible_next_moves():
+            self.send('bestmove (none)')
+            return
+        if 'multipv' in options:
+            if self.strategy_name == 'r':
+                self.send('info string multipv needs a searching strategy')
+            else:
+                self.multipv(int(options['multipv']), depth)
+            return
+        if self.own_book:
+            if self.book is None:
+                self.book = OpeningBook()
+                if os.path.exists(BOOK_PATH):
+                    self.book = OpeningBook.load(BOOK_PATH)
+            move = self.book.lookup(self.state)
+            if move is not None and move in self.state.possible_next_moves():
+                self.send('info string book')
+                self.send('bestmove ' + self.state.format_move(move))
+                return
+        moves = self.state.tactical_moves()
+        if len(moves) == 1:
+            self.send('info string forced')
+            self.send('bestmove ' + self.state.format_move(moves[0]))
+            return
+        if self.strategy is None:
+            self.strategy = load_strategy(self.strategy_name)()
+
+        start = time.time()
+        reported = [start]
+
+        def progress(nodes, depth, best):
+            now = time.time()
+            if now - reported[0] >= 1:
+                reported[0] = now
+                self.send('info nodes {} time {}'.format(
+                    nodes, int((now - start) * 1000)))
+
+        control = SearchControl(
+            progress if self.strategy_name != 'mpy' else None)
+        # Whatever the search, it is cancelled once movetime is up.
+        timer = None
+        if movetime:
+            timer = threading.Timer(movetime, control.cancel)
+            timer.daemon = True
+            timer.start()
+        move = None
+        try:
+            if self.strategy_name != 'mpy':
+                move = self.strategy.suggest_move(self.state, control)
+                self.send('info time {}'.format(
+                    int((time.time() - start) * 1000)))
+            else:
+                self.search_depths(depth, movetime, control, start)
+        except SearchCancelled:
+            self.send('info string stopped at movetime')
+        finally:
+            if timer is not None:
+                timer.cancel()
+        if control.best is not None:
+            move = control.best[1]
+        elif move is None:
+            move = fallback_move(self.state)
+        self.send('bestmove ' + self.state.format_move(move))
+
+    def search_depths(self, depth, movetime, control, start):
+        """(Engine, int, float, SearchControl, float) -> NoneType
+
+        Search the current position with Minimax Myopic one more move
+        deep at a time, up to depth, reporting an info line after each
+        depth, until the next depth is not expected to end within
+        movetime seconds of start.  The best move of the last depth is
+        left in control.best.
+        """
+
+        self.strategy.n = depth
+        self.strategy.nodes = 0
+        previous_nodes = 0
+        before = start
+        for d, move, score, stats in self.strategy.iter_suggestions(
+                self.state, control):
+            now = time.time()
+            self.send('info depth {} nodes {} score {} time {} pv {}'.format(
+                d, self.strategy.nodes, score + 0.0,
+                int((now - start) * 1000),
+                self.state.format_move(move)))
+            # Each depth costs roughly the previous one times the growth
+            # just observed.
+            growth = stats['nodes'] / max(previous_nodes, 1)
+            if movetime and (now - start) + (now - before) * growth > movetime:
+                break
+            previous_nodes, before = stats['nodes'], now
+
+    def multipv(self, k, depth):
+        """(Engine, int, int) -> NoneType
+
+        Report the k best moves of the current position, best first, each
+        with its score on an info line, in one search, then the best of
+        them as bestmove.  Minimax Myopic looks depth moves ahead.
+
+        >>> engine = Engine()
+        >>> engine.outfile = __import__('io').StringIO()
+        >>> engine.set_position(['subtract', '14'])
+        >>> engine.go(['multipv', '2'])
+        >>> print(engine.outfile.getvalue().strip())
+        info multipv 1 score 1.0 pv 9
+        info multipv 2 score 1.0 pv 4
+        bestmove 9
+        """
+
+        if self.strategy is None:
+            self.strategy = load_strategy(self.strategy_name)()
+        if self.strategy_name == 'mpy':
+            self.strategy.n = depth
+        ranked = self.strategy.rank_moves(self.state, k)
+        for i in range(min(k, len(ranked))):
+            self.send('info multipv {} score {} pv {}'.format(
+                i + 1, ranked[i][0] + 0.0,
+                self.state.format_move(ranked[i][1])))
+        self.send('bestmove ' + self.state.format_move(ranked[0][1]))
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--test']:
+        import doctest
+        doctest.testmod()
+    else:
+        Engine().run()
@@ -0,0 +1,321 @@
+import asyncio
+import multiprocessing
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from random import randint
+from registry import STRATEGIES, load_game, load_strategy
+from search_control import SearchCancelled, SearchControl, fallback_move
+
+# Strategies built so far by this worker process, by (name, depth), so
+# that whatever a strategy remembers survives from one request to the next.
+_strategies = {}
+
+
+def suggest_move(spec, state, cancel=None):
+    """((str, int), GameState, Event) -> Move
+
+    Return the move suggested for state by the strategy described by spec,
+    a strategy letter from registry.STRATEGIES and a depth for Minimax
+    Myopic.  Runs inside a worker process of the GameServer pool.
+
+    Once cancel, if given, is set, the search stops within a few thousand
+    positions, and the best move it has found so far is returned instead,
+    or failing that the tactical move with the best rough outcome.
+
+    >>> state = load_game('s')('p1', current_total=25)
+    >>> suggest_move(('mp', 0), state)
+    SubtractSquareMove(25)
+    """
+
+    if spec not in _strategies:
+        name, depth = spec
+        if name == 'mpy':
+            _strategies[spec] = load_strategy(name)(n=depth)
+        else:
+            _strategies[spec] = load_strategy(name)()
+    control = SearchControl(event=cancel) if cancel is not None else None
+    try:
+        return _strategies[spec].suggest_move(state, control)
+    except SearchCancelled:
+        if control.best is not None:
+            return control.best[1]
+        return fallback_move(state)
+
+
+class GameSession:
+    """ One game between a client of a GameServer and the computer.
+
+    The turn loop is that of GameView.play, with input() and print()
+    replaced by reads and writes on the client's connection.  At any
+    prompt the client may type stats to see the server's figures.
+
+    server: GameServer       -- server that owns this session
+    number: int              -- identifies the session within server
+    latencies: list of float -- seconds taken by each computer move,
+                                from request to answer
+    """
+
+    def __init__(self, server, reader, writer, number):
+        """(GameSession, GameServer, StreamReader, StreamWriter, int)
+                                                             -> NoneType
+
+        Initialize a session for a client connected through reader and
+        writer.
+        """
+
+        self.server, self.number = server, number
+        self.reader, self.writer = reader, writer
+        self.latencies = []
+        self.state = None
+        self.spec = None
+
+    def __repr__(self):
+        """(GameSession) -> str
+
+        Return a short description of self.
+        """
+
+        return 'GameSession({}, {})'.format(self.number, repr(self.spec))
+
+    async def say(self, text):
+        """(GameSession, str) -> NoneType
+
+        Send text and a newline to the client.
+        """
+
+        self.writer.write((text + '\n').encode())
+        await self.writer.drain()
+
+    async def ask(self, prompt):
+        """(GameSession, str) -> str
+
+        Send prompt and return the client's next line, answering any
+        stats requests on the way.  Raise EOFError once the client leaves.
+        """
+
+        while True:
+            self.writer.write(prompt.encode())
+            await self.writer.drain()
+            line = await self.reader.readline()
+            if not line:
+                raise EOFError('client disconnected')
+            line = line.decode().strip()
+            if line != 'stats':
+                return line
+            await self.say(self.server.stats())
+
+    async def setup(self):
+        """(GameSession) -> NoneType
+
+        Ask the client for a game, who plays first and a strategy, like
+        the prompts of game_view.py and GameView.
+        """
+
+        game = ''
+        while game not in ('s', 't'):
+            game = await self.ask('Press s to play SUBTRACT SQUARE, '
+                                  't to play TIPPY: ')
+        first = await self.ask('Type c if you wish the computer to '
+                               'play first ')
+        p = 'p2' if first == 'c' else 'p1'
+        if game == 's':
+            top = ''
+            while not top.isdigit() or int(top) < 1:
+                top = await self.ask('Maximum starting value? ')
+            self.state = load_game('s')(
+                p, current_total=randint(1, int(top)))
+        else:
+            n = ''
+            while not n.isdigit() or int(n) < 3:
+                n = await self.ask('Enter the size n of an nxn grid of '
+                                   'your choice: ')
+            self.state = load_game('t')(p, n=int(n))
+        name = ''
+        while name not in STRATEGIES:
+            name = await self.ask('Strategy for computer (r, m, mm, mp, '
+                                  'mpy, a): ')
+        depth = '0'
+        if name == 'mpy':
+            depth = ''
+            while not depth.isdigit() or int(depth) < 1:
+                depth = await self.ask('Number of moves to look ahead: ')
+        self.spec = (name, int(depth))
+
+    async def play(self):
+        """(GameSession) -> NoneType
+
+        Play a game, as GameView.play does.
+        """
+
+        await self.say(self.state.instructions)
+        await self.say(str(self.state))
+        while self.state.possible_next_moves():
+            if self.state.next_player == 'p1':
+                m = None
+                while m not in self.state.possible_next_moves():
+                    if m is not None:
+                        await self.say('Illegal move: {}\nPlease try '
+                                       'again.\n'.format(m))
+                        await self.say(str(self.state))
+                    text = await self.ask('Your move: ')
+                    try:
+                        m = self.state.parse_move(text)
+                    except ValueError:
+                        m = text
+                await self.say('You choose: {}'.format(m))
+            else:
+                m = await self.server.suggest_move(self, self.state)
+                await self.say('The AI chooses: {}'.format(m))
+            self.state = self.state.apply_move(m)
+            await self.say('New game state: ' + str(self.state) + '\n')
+
+        if self.state.winner('p2'):
+            await self.say('Beat ya!')
+        elif self.state.winner('p1'):
+            await self.say('Congrats -- you won!!')
+        else:
+            await self.say('We tied...')
+
+
+class GameServer:
+    """ Host many concurrent GameSessions on one socket.
+
+    Computer moves for every session go to a single shared pool of
+    worker processes, so a slow search only occupies one worker and
+    never blocks the other sessions.  A search taking longer than
+    timeout seconds is cancelled, which frees its worker at once, and
+    the best move found so far is played.
+
+    pool: ProcessPoolExecutor -- workers searching for computer moves
+    timeout: float            -- seconds a computer move may take, or
+                                 None for no limit
+    pending: int              -- computer moves requested, not yet answered
+    sessions: dict of {int: GameSession} -- sessions currently connected
+    """
+
+    def __init__(self, workers=None, timeout=None):
+        """(GameServer, int, float) -> NoneType
+
+        Initialize a server whose pool has workers processes, one per
+        CPU if workers is None, giving each computer move timeout
+        seconds at most.
+        """
+
+        # Workers are spawned rather than forked: a forked worker would
+        # inherit, and keep open, every client socket open at the time.
+        context = multiprocessing.get_context('spawn')
+        self.pool = ProcessPoolExecutor(workers, mp_context=context)
+        self.timeout = timeout
+        # Cancelling a search in a worker needs an Event shared with it,
+        # which a Manager process provides.
+        self.manager = context.Manager() if timeout is not None else None
+        self.pending = 0
+        self.sessions = {}
+        self.count = 0
+
+    async def suggest_move(self, session, state):
+        """(GameServer, GameSession, GameState) -> Move
+
+        Return the move suggested for state by session's strategy,
+        recording how long session waited for it.
+        """
+
+        start = time.time()
+        self.pending += 1
+        cancel = self.manager.Event() if self.manager is not None else None
+        try:
+            future = asyncio.get_running_loop().run_in_executor(
+                self.pool, suggest_move, session.spec, state, cancel)
+            try:
+                move = await asyncio.wait_for(asyncio.shield(future),
+                                              self.timeout)
+            except asyncio.TimeoutError:
+                cancel.set()
+                move = await future
+        finally:
+            self.pending -= 1
+        session.latencies.append(time.time() - start)
+        return move
+
+    def stats(self):
+        """(GameServer) -> str
+
+        Return the queue depth and, for each session, the number of
+        computer moves and their mean and worst latency in milliseconds.
+
+        >>> server = GameServer(1)
+        >>> server.stats()
+        'queue 0 sessions 0'
+        >>> server.pool.shutdown()
+        """
+
+        lines = ['queue {} sessions {}'.format(self.pending,
+                                               len(self.sessions))]
+        for number in sorted(self.sessions):
+            latencies = self.sessions[number].latencies
+            if latencies:
+                lines.append('session {} moves {} mean {} max {}'.format(
+                    number, len(latencies),
+                    int(sum(latencies) / len(latencies) * 1000),
+                    int(max(latencies) * 1000)))
+            else:
+                lines.append('session {} moves 0'.format(number))
+        return '\n'.join(lines)
+
+    async def handle(self, reader, writer):
+        """(GameServer, StreamReader, StreamWriter) -> NoneType
+
+        Run a session for the client connected through reader and writer,
+        until its game ends or it disconnects.  An unexpected error ends
+        the session only, and is written to stderr.
+        """
+
+        self.count += 1
+        session = GameSession(self, reader, writer, self.count)
+        self.sessions[session.number] = session
+        try:
+            await session.setup()
+            await session.play()
+        except (EOFError, ConnectionError):
+            pass
+        except Exception:
+            # A bug met by one session must not take down the others, nor
+            # drop this client without a trace.
+            print('session {} failed:'.format(session.number),
+                  file=sys.stderr)
+            traceback.print_exc()
+        finally:
+            del self.sessions[session.number]
+            writer.close()
+
+    async def serve(self, port=None, path=None):
+        """(GameServer, int, str) -> NoneType
+
+        Accept clients forever on the local TCP port port, or on the Unix
+        socket at path if one is given.
+        """
+
+        if path is not None:
+            server = await asyncio.start_unix_server(self.handle, path)
+        else:
+            server = await asyncio.start_server(self.handle, '127.0.0.1',
+                                                port)
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    timeout = None
+    if args[:1] == ['--timeout']:
+        timeout, args = float(args[1]), args[2:]
+    if args == ['--test']:
+        import doctest
+        doctest.testmod()
+    elif args[:1] == ['--unix']:
+        asyncio.run(GameServer(timeout=timeout).serve(path=args[1]))
+    else:
+        port = int(args[0]) if args else 8765
+        asyncio.run(GameServer(timeout=timeout).serve(port=port))
@@ -8,14 +8,19 @@ class GameState:
     next_player: str    -- player about to move, unless game is over
                            in which case it is the opponent of the player
                            who just moved
-    over: bool          -- flag indicating whether game is over
-    instructions: str   -- description of what actions to take at each turn
+    over: bool          -- whether game is over, from possible_next_moves
+    instructions: str   -- class attribute; description of what actions to
+                           take at each turn
     WIN: float          -- class constant indicating next player has won
     LOSE: float         -- class constant indicating next player has lost
     DRAW: float         -- class constant indicating next player tied
     '''
     # assign class constants
     WIN, LOSE, DRAW = 1.0, -1.0, 0.0
+    instructions = 'Generic instructions --- fill in with subclass'
+    # States keep their attributes in slots rather than a __dict__, as
+    # searches make a great many of them; subclasses add their own.
+    __slots__ = ('next_player',)
 
     def __init__(self, p, interactive=False):
         '''(GameState, str, bool) -> NoneType
@@ -25,8 +30,15 @@ class GameState:
 
         prerequisite - p is in {'p1', 'p2'}
         '''
-        self.next_player, self.over = p, False
-        self.instructions = 'Generic instructions --- fill in with subclass'
+        self.next_player = p
+
+    @property
+    def over(self):
+        '''(GameState) -> bool
+
+        Return whether the game is over, as no legal moves are left.
+        '''
+        return not self.possible_next_moves()
 
     def opponent(self):
         '''(GameState) -> str
@@ -35,7 +47,7 @@ class GameState:
 
         >>> gs = GameState('p1')
         >>> gs.opponent()
-        p2
+        'p2'
         '''
         if self.next_player == 'p1':
             return 'p2'
@@ -49,6 +61,54 @@ class GameState:
         '''
         raise NotImplementedError('Implemented in a subclass')
 
+    def parse_move(self, text):
+        '''(GameState, str) -> Move
+
+        Return the move described by text, in the notation produced
+        by format_move.
+        '''
+        raise NotImplementedError('Implemented in a subclass')
+
+    def format_move(self, move):
+        '''(GameState, Move) -> str
+
+        Return a compact, whitespace-free description of move that
+        parse_move turns back into an equivalent move.
+        '''
+        raise NotImplementedError('Implemented in a subclass')
+
+    def to_notation(self):
+        '''(GameState) -> str
+
+        Return a short, whitespace-free description of the position of
+        self, including the next player, that from_notation reads back.
+        '''
+        raise NotImplementedError('Implemented in a subclass')
+
+    @classmethod
+    def from_notation(cls, text):
+        '''(GameState.__class__, str) -> GameState
+
+        Return the state described by text, as written by to_notation.
+        '''
+        raise NotImplementedError('Implemented in a subclass')
+
+    def to_bytes(self):
+        '''(GameState) -> bytes
+
+        Return a compact binary description of the position of self,
+        including the next player, that from_bytes reads back.
+        '''
+        raise NotImplementedError('Implemented in a subclass')
+
+    @classmethod
+    def from_bytes(cls, data):
+        '''(GameState.__class__, bytes) -> GameState
+
+        Return the state described by data, as written by to_bytes.
+        '''
+        raise NotImplementedError('Implemented in a subclass')
+
     def apply_move(self, move):
         '''(GameState, Move) -> GameState
 
@@ -75,6 +135,60 @@ class GameState:
         '''
         raise NotImplementedError('Method must be implemented in a subclass')
 
+    def search_moves(self):
+        '''(GameState) -> list of Move
+
+        Return the moves from self that a search needs to try, leaving
+        out moves no better than one kept.  An empty list means the
+        outcome of self is settled, whether or not the game is over.
+        '''
+        return self.possible_next_moves()
+
+    def tactical_moves(self):
+        '''(GameState) -> list of Move
+
+        Return the moves from self worth searching: a move that wins at
+        once on its own, or else those that stop the opponent winning on
+        the next move, if any do, or else all of search_moves.  If the
+        outcome is settled, return any one legal move.  Strategies play a
+        lone tactical move without searching.
+        '''
+        return self.search_moves() or self.possible_next_moves()[:1]
+
+    def search_size(self, depth=None):
+        '''(GameState, int) -> float
+
+        Return a rough estimate of the number of positions in the game
+        tree below self, depth moves deep, or to the end of the game if
+        depth is None, before any pruning.  Used to predict how long a
+        search will take.
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
+
+    def moves_left(self):
+        '''(GameState) -> int
+
+        Return a rough estimate of the number of moves, by both players,
+        left in the game from self.  Used to share out a game clock.
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
+
+    def positions_left(self):
+        '''(GameState) -> float
+
+        Return a rough upper bound on the number of different positions
+        that can be reached from self.
+        '''
+        raise NotImplementedError('Method must be implemented in a subclass')
+
+    def outcome_known(self):
+        '''(GameState) -> bool
+
+        Return whether rough_outcome of self is the outcome of best play
+        from self, as it is when the game is over.
+        '''
+        return self.over
+
     def outcome(self):
         ''' (GameState) -> float
 
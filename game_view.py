@@ -1,15 +1,22 @@
+import time
+
+
 class GameView:
     '''
     A game view for a two-player, sequential move, zero-sum,
     perfect-information game.
     '''
 
-    def __init__(self, state, strategy):
+    def __init__(self, state, strategy, ponder=False, book=None, clock=None):
         '''(GameView, GameState.__class__,
-            Strategy.__class__) -> NoneType
+            Strategy.__class__, bool, OpeningBook, float) -> NoneType
 
         Create GameView self for game described by state, where
-        computer uses given strategy.
+        computer uses given strategy, after the moves of book if
+        there is one.  If ponder, the computer thinks about its
+        answers while the human picks a move.  If clock is given, each
+        player has clock seconds for the whole game, and loses when they
+        run out; the computer shares out its time with a TimeManager.
         '''
         player = input('Type c if you wish the computer to play first ')
         if player == 'c':
@@ -18,6 +25,30 @@ class GameView:
             p = 'p1'
         self.state = state(p, interactive=True)
         self.strategy = strategy(interactive=True)
+        # Pondering and books are imported only when asked for, to keep
+        # startup cheap.
+        if book is not None:
+            from strategy_book import StrategyBook
+            self.strategy = StrategyBook(book, self.strategy)
+        self.ponderer = None
+        if ponder:
+            from ponder import Ponderer
+            self.ponderer = Ponderer(self.strategy)
+        self.clocks = None
+        if clock is not None:
+            from time_manager import TimeManager
+            self.clocks = {'p1': TimeManager(clock), 'p2': TimeManager(clock)}
+
+    def out_of_time(self):
+        ''' (GameView) -> str
+
+        Return the player whose clock has run out, or None.
+        '''
+        if self.clocks:
+            for p in ('p1', 'p2'):
+                if self.clocks[p].flagged:
+                    return p
+        return None
 
     def play(self):
         ''' (GameView) -> NoneType
@@ -27,25 +58,56 @@ class GameView:
         print(self.state.instructions)
         print(self.state)
         print()
-        while self.state.possible_next_moves():
-            if self.state.next_player == 'p1':
-                m = self.state.get_move()
-                while not m in self.state.possible_next_moves():
-                    # The move was illegal.
-                    print('Illegal move: {}\nPlease try again.\n'.format(m))
-                    print(self.state.instructions)
-                    print(self.state)
+        try:
+            while (self.state.possible_next_moves() and
+                   not self.out_of_time()):
+                start = time.time()
+                if self.state.next_player == 'p1':
+                    if self.ponderer:
+                        self.ponderer.start(self.state)
                     m = self.state.get_move()
-                print('You choose: {}'.format(m))
-            else:
-                # The computer makes a move.
-                m = self.strategy.suggest_move(self.state)
-                print('The AI chooses: {}'.format(m))
-            self.state = self.state.apply_move(m)
-            print('New game state: ', str(self.state))
-            print()
+                    while not m in self.state.possible_next_moves():
+                        # The move was illegal.
+                        print('Illegal move: {}\nPlease try '
+                              'again.\n'.format(m))
+                        print(self.state.instructions)
+                        print(self.state)
+                        m = self.state.get_move()
+                    print('You choose: {}'.format(m))
+                    if self.ponderer:
+                        self.ponderer.stop()
+                    if self.clocks:
+                        self.clocks['p1'].spend(time.time() - start)
+                else:
+                    # The computer makes a move, unless it found one while
+                    # the human was thinking.
+                    m = None
+                    if self.ponderer:
+                        m = self.ponderer.answer(self.state)
+                    if m is None and self.clocks:
+                        m = self.clocks['p2'].suggest_move(self.strategy,
+                                                           self.state)
+                    elif m is None:
+                        m = self.strategy.suggest_move(self.state)
+                    elif self.clocks:
+                        self.clocks['p2'].spend(time.time() - start)
+                    print('The AI chooses: {}'.format(m))
+                self.state = self.state.apply_move(m)
+                print('New game state: ', str(self.state))
+                if self.clocks:
+                    print('Clocks: you {:.1f} s, the AI {:.1f} s'.format(
+                        self.clocks['p1'].clock, self.clocks['p2'].clock))
+                print()
+        finally:
+            # Quitting mid-game must not leave the ponderer searching.
+            if self.ponderer:
+                self.ponderer.stop()
 
-        if self.state.winner('p2'):
+        if self.out_of_time() == 'p1':
+            print('Your time is up -- beat ya!')
+        elif self.out_of_time() == 'p2':
+            print('The AI ran out of time -- you won!!')
+        elif self.state.winner('p2'):
             # p2, the computer, wins
             print('Beat ya!')
         elif self.state.winner('p1'):
@@ -55,29 +117,31 @@ class GameView:
             print('We tied...')
 
 if __name__ == '__main__':
-    from subtract_square_state import SubtractSquareState
-    from tippy_game_state import TippyGameState
-    game_state = ({'s': SubtractSquareState, 't': TippyGameState})
-    from strategy_random import StrategyRandom
-    from strategy_minimax import StrategyMinimax
-    from strategy_minimax_prune import StrategyMinimaxPrune
-    from strategy_minimax_memoize import StrategyMinimaxMemoize
-    from strategy_minimax_myopic import StrategyMinimaxMyopic
-    strategy = ({'r': StrategyRandom, 'm': StrategyMinimax,
-                 'mp': StrategyMinimaxPrune, 'mm': StrategyMinimaxMemoize,
-                 'mpy': StrategyMinimaxMyopic})
+    # Only the game and strategy picked are ever imported.
+    from registry import GAMES, STRATEGIES, load_game, load_strategy
     g = ''
-    while not g in game_state.keys():
+    while not g in GAMES.keys():
         print("\n******* WELCOME TO THE GAME CENTER *******\n")
         g = input('Press s to play SUBTRACT SQUARE, t to play TIPPY:\n ')
     s = ''
-    while not s in strategy.keys():
+    while not s in STRATEGIES.keys():
         print("Press: \n")
         s = input('\t - r for random strategy for computer, \n' +
                   '\t - m for Minimax strategy, \n' +
                   '\t - mm for Minimax Memoize strategy, \n' +
                   '\t - mp for Minimax Prune strategy,\n' +
-                  '\t - mpy for Minimax Myopic strategy: ')
-    GameView(game_state[g], strategy[s]).play()
+                  '\t - mpy for Minimax Myopic strategy,\n' +
+                  '\t - a for Adaptive strategy: ')
+    p = input('Type p to let the computer think during your turns ')
+    c = ''
+    while c != 'x' and not c.replace('.', '', 1).isdigit():
+        c = input('Seconds on each clock, or x to play without clocks ')
+    from opening_book import OpeningBook, BOOK_PATH
+    import os
+    book = None
+    if s != 'r' and os.path.exists(BOOK_PATH):
+        book = OpeningBook.load(BOOK_PATH)
+    clock = None if c == 'x' else float(c)
+    GameView(load_game(g), load_strategy(s), p == 'p', book, clock).play()
     
 
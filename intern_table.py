@@ -0,0 +1,83 @@
+from weakref import WeakValueDictionary
+
+
+class InternTable:
+    """ The one state kept for each position, so that a position reached
+    by different orders of moves is built once and shared.
+
+    States are held weakly: a position nobody uses any more drops out of
+    the table by itself.  The table is also emptied when it reaches its
+    limit.
+
+    limit: int -- the most positions held at once
+    states: WeakValueDictionary -- the state for each position key
+    hits: int -- how many lookups found a state
+    """
+
+    def __init__(self, limit=10 ** 6):
+        """(InternTable, int) -> NoneType
+
+        Initialize self to an empty table of at most limit positions.
+
+        >>> table = InternTable(10)
+        >>> len(table), table.hits
+        (0, 0)
+        """
+
+        self.limit = limit
+        self.states = WeakValueDictionary()
+        self.hits = 0
+
+    def __repr__(self):
+        """(InternTable) -> str
+
+        Return a string representation of self.
+
+        >>> InternTable(10)
+        InternTable(10)
+        """
+
+        return 'InternTable({})'.format(self.limit)
+
+    def __len__(self):
+        """(InternTable) -> int
+
+        Return the number of positions held in self.
+        """
+
+        return len(self.states)
+
+    def lookup(self, key):
+        """(InternTable, object) -> GameState
+
+        Return the state held for the position key, or None.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> table = InternTable()
+        >>> state = TippyGameState('p1')
+        >>> table.add(state.position_key(), state)
+        >>> table.lookup((3, 'p1', 0, 0)) is state
+        True
+        >>> table.lookup((3, 'p2', 0, 0)) is None
+        True
+        """
+
+        state = self.states.get(key)
+        if state is not None:
+            self.hits += 1
+        return state
+
+    def add(self, key, state):
+        """(InternTable, object, GameState) -> NoneType
+
+        Hold state for the position key.
+        """
+
+        if len(self.states) >= self.limit:
+            self.states.clear()
+        self.states[key] = state
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,104 @@
+import sys
+from registry import load_game, load_strategy
+from time_manager import TimeManager
+
+
+def make_strategy(spec):
+    """(str) -> Strategy
+
+    Return the strategy described by spec: a letter from
+    registry.STRATEGIES, followed for Minimax Myopic by a colon and the
+    number of moves to look ahead.
+
+    >>> make_strategy('mpy:6')
+    StrategyMinimaxMyopic(6)
+    >>> make_strategy('mp')
+    StrategyMinimaxPrune()
+    """
+
+    name, colon, depth = spec.partition(':')
+    if name == 'mpy' and depth:
+        return load_strategy(name)(int(depth))
+    return load_strategy(name)()
+
+
+def play_game(state, players, clock=None, increment=0.0):
+    """(GameState, dict of {str: Strategy}, float, float) -> str
+
+    Play the game from state to its end, each of p1 and p2 playing the
+    moves of its strategy in players, and return the winner, or None for
+    a draw.  If clock is given, each player has clock seconds, gaining
+    increment after each move, shared out by a TimeManager, and loses
+    when they run out.
+
+    >>> from strategy_minimax_prune import StrategyMinimaxPrune
+    >>> players = {'p1': StrategyMinimaxPrune(), 'p2': StrategyMinimaxPrune()}
+    >>> play_game(load_game('s')('p1', current_total=10), players)
+    'p2'
+    """
+
+    clocks = None
+    if clock is not None:
+        clocks = {'p1': TimeManager(clock, increment),
+                  'p2': TimeManager(clock, increment)}
+    while state.possible_next_moves():
+        p = state.next_player
+        if clocks:
+            move = clocks[p].suggest_move(players[p], state)
+            if clocks[p].flagged:
+                return state.opponent()
+        else:
+            move = players[p].suggest_move(state)
+        state = state.apply_move(move)
+    for p in ('p1', 'p2'):
+        if state.winner(p):
+            return p
+    return None
+
+
+def play_match(game, size, specs, games=2, clock=None, increment=0.0):
+    """(str, int, list of str, int, float, float) -> list of float
+
+    Play games games of game, a letter from registry.GAMES, starting at
+    size (the board size of Tippy, the total of Subtract Square),
+    between the two strategies described by specs, as make_strategy
+    reads them, each going first in turn.  Return the points of each
+    strategy: 1 for a win and 0.5 for a draw.
+
+    >>> play_match('s', 10, ['mp', 'mm'])
+    [1.0, 1.0]
+    """
+
+    strategies = [make_strategy(spec) for spec in specs]
+    points = [0.0, 0.0]
+    for i in range(games):
+        first = i % 2
+        players = {'p1': strategies[first], 'p2': strategies[1 - first]}
+        if game == 't':
+            state = load_game(game)('p1', n=size)
+        else:
+            state = load_game(game)('p1', current_total=size)
+        winner = play_game(state, players, clock, increment)
+        if winner is None:
+            points[0] += 0.5
+            points[1] += 0.5
+        else:
+            points[first if winner == 'p1' else 1 - first] += 1
+    return points
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--test']:
+        import doctest
+        doctest.testmod()
+    elif len(sys.argv) < 5:
+        print('usage: python match.py GAME SIZE STRATEGY STRATEGY '
+              '[GAMES [CLOCK [INCREMENT]]]')
+    else:
+        game, size, specs = sys.argv[1], int(sys.argv[2]), sys.argv[3:5]
+        games = int(sys.argv[5]) if len(sys.argv) > 5 else 2
+        clock = float(sys.argv[6]) if len(sys.argv) > 6 else None
+        increment = float(sys.argv[7]) if len(sys.argv) > 7 else 0.0
+        points = play_match(game, size, specs, games, clock, increment)
+        print('{} {}  {} {}'.format(specs[0], points[0],
+                                     specs[1], points[1]))
@@ -4,4 +4,6 @@ class Move:
     zero-sum, perfect-information game.
     '''
 
-    # There is nothing to define here!
+    # There is nothing to define here!  An empty __slots__ lets
+    # subclasses that declare their own do without a __dict__.
+    __slots__ = ()
@@ -0,0 +1,113 @@
+class MoveLog:
+    """ The moves of a game so far, in the order they were played.
+
+    A log is never changed: append returns a new log that links back to
+    the old one, so a game state and every state reached from it share
+    the moves they have in common, and each stores only its last move.
+
+    player: str -- the player of the last move, or None for no moves
+    move: Move -- the last move, or None for no moves
+    parent: MoveLog -- the log before the last move, or None
+    length: int -- the number of moves
+    """
+
+    __slots__ = ('player', 'move', 'parent', 'length')
+
+    def __init__(self, player=None, move=None, parent=None):
+        """(MoveLog, str, Move, MoveLog) -> NoneType
+
+        Initialize self to parent followed by move of player, or to an
+        empty log if there is no parent.
+
+        >>> len(MoveLog())
+        0
+        """
+
+        self.player, self.move, self.parent = player, move, parent
+        self.length = 0 if parent is None else parent.length + 1
+
+    def __repr__(self):
+        """(MoveLog) -> str
+
+        Return a string representation of self.
+
+        >>> MoveLog().append('p1', 4).append('p2', 1)
+        MoveLog([('p1', 4), ('p2', 1)])
+        """
+
+        return 'MoveLog({})'.format(repr(list(self)))
+
+    def __len__(self):
+        """(MoveLog) -> int
+
+        Return the number of moves in self.
+        """
+
+        return self.length
+
+    def __iter__(self):
+        """(MoveLog) -> iterator of (str, Move)
+
+        Return the player and move of each move in self, first to last.
+
+        >>> [move for player, move in MoveLog().append('p1', 4)]
+        [4]
+        """
+
+        entries = []
+        log = self
+        while log.parent is not None:
+            entries.append((log.player, log.move))
+            log = log.parent
+        return reversed(entries)
+
+    def append(self, player, move):
+        """(MoveLog, str, Move) -> MoveLog
+
+        Return a new log of the moves of self followed by move of player.
+        self is left as it is.
+
+        >>> log = MoveLog().append('p1', 4)
+        >>> longer = log.append('p2', 1)
+        >>> len(log), len(longer), longer.parent is log
+        (1, 2, True)
+        """
+
+        return MoveLog(player, move, self)
+
+    def moves(self, player):
+        """(MoveLog, str) -> list of Move
+
+        Return the moves of player in self, first to last.
+
+        >>> log = MoveLog().append('p1', 4).append('p2', 1).append('p1', 9)
+        >>> log.moves('p1')
+        [4, 9]
+        """
+
+        return [move for mover, move in self if mover == player]
+
+    @classmethod
+    def from_players(cls, player_to_move):
+        """(MoveLog.__class__, dict of {str: list of Move}) -> MoveLog
+
+        Return a log of the moves in player_to_move, taking turns from
+        p1 while both players have moves left.
+
+        >>> MoveLog.from_players({'p1': [4, 9], 'p2': [1]})
+        MoveLog([('p1', 4), ('p2', 1), ('p1', 9)])
+        """
+
+        log = cls()
+        p1, p2 = player_to_move.get('p1', []), player_to_move.get('p2', [])
+        for i in range(max(len(p1), len(p2))):
+            if i < len(p1):
+                log = log.append('p1', p1[i])
+            if i < len(p2):
+                log = log.append('p2', p2[i])
+        return log
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
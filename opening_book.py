@@ -0,0 +1,181 @@
+import os
+import sys
+
+# Book read by game_view.py and the engine when it exists; build it with
+#   python opening_book.py
+BOOK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                         'opening_book.txt')
+
+
+class OpeningBook:
+    """ Moves worked out ahead of time for the first moves of a game.
+
+    The book is a text file with one line per position: the position as
+    written by GameState.to_notation, a space, and the move to play as
+    written by GameState.format_move.  Tippy and Subtract Square
+    positions may share one book, as their notations never coincide.
+
+    moves: dict of {str: str} -- move text for each position notation
+    """
+
+    def __init__(self, moves=None):
+        """(OpeningBook, dict of {str: str}) -> NoneType
+
+        Initialize a book holding moves.
+
+        >>> OpeningBook().moves
+        {}
+        """
+
+        self.moves = {} if moves is None else moves
+
+    def __repr__(self):
+        """(OpeningBook) -> str
+
+        Return a string representation of self.
+
+        >>> OpeningBook({'p1:4': '4'})
+        OpeningBook({'p1:4': '4'})
+        """
+
+        return 'OpeningBook({})'.format(repr(self.moves))
+
+    def __len__(self):
+        """(OpeningBook) -> int
+
+        Return the number of positions in self.
+        """
+
+        return len(self.moves)
+
+    def lookup(self, state):
+        """(OpeningBook, GameState) -> Move
+
+        Return the book move for state, or None if state is not in self.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> book = OpeningBook({'p1:4': '4'})
+        >>> book.lookup(SubtractSquareState('p1', current_total=4))
+        SubtractSquareMove(4)
+        >>> book.lookup(SubtractSquareState('p2', current_total=4)) is None
+        True
+        """
+
+        text = self.moves.get(state.to_notation())
+        if text is None:
+            return None
+        return state.parse_move(text)
+
+    def build(self, root, plies, strategy, log=None):
+        """(OpeningBook, GameState, int, Strategy, SolveLog) -> NoneType
+
+        Add strategy's move for every position reached from root in
+        fewer than plies moves where the game is not over.  If log is
+        given, each move found is recorded there, as kind book, and moves
+        already recorded by an earlier build that was stopped are taken
+        from it without searching again.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> from strategy_minimax_prune import StrategyMinimaxPrune
+        >>> book = OpeningBook()
+        >>> book.build(SubtractSquareState('p1', current_total=10), 2,
+        ...            StrategyMinimaxPrune())
+        >>> sorted(book.moves.items())
+        [('p1:10', '4'), ('p2:1', '1'), ('p2:6', '4'), ('p2:9', '9')]
+        """
+
+        level = [root]
+        for ply in range(plies):
+            next_level = []
+            for state in level:
+                key = state.to_notation()
+                if key in self.moves or not state.possible_next_moves():
+                    continue
+                text = None if log is None else log.kind('book').get(key)
+                if text is None:
+                    text = state.format_move(strategy.suggest_move(state))
+                    if log is not None:
+                        log.add('book', key, text)
+                self.moves[key] = text
+                next_level.extend(state.apply_move(move)
+                                  for move in state.possible_next_moves())
+            level = next_level
+
+    def save(self, path):
+        """(OpeningBook, str) -> NoneType
+
+        Write self to the file at path.
+        """
+
+        with open(path, 'w') as book_file:
+            for key in sorted(self.moves):
+                book_file.write('{} {}\n'.format(key, self.moves[key]))
+
+    @classmethod
+    def load(cls, path):
+        """(OpeningBook.__class__, str) -> OpeningBook
+
+        Return the book saved in the file at path.
+        """
+
+        moves = {}
+        with open(path) as book_file:
+            for line in book_file:
+                key, text = line.split()
+                moves[key] = text
+        return cls(moves)
+
+
+def build_default_book(log=None):
+    """(SolveLog) -> OpeningBook
+
+    Return the book shipped with the game center: 3x3 Tippy solved
+    for the first four moves, the first move of 4x4 Tippy searched four
+    moves deep, and the first move of Subtract Square solved for each
+    starting total up to 100.  Either player may move first.  If log is
+    given, the moves and the scores of the solver are recorded there, and
+    a build stopped part way resumes from them.
+    """
+
+    from subtract_square_state import SubtractSquareState
+    from tippy_game_state import TippyGameState
+    from strategy_minimax_memoize import StrategyMinimaxMemoize
+    from strategy_minimax_myopic import StrategyMinimaxMyopic
+
+    book = OpeningBook()
+    table = {}
+    if log is not None:
+        from solve_log import LoggedTable
+        table = LoggedTable(log)
+    solver = StrategyMinimaxMemoize(state_holder=table)
+    for p in ('p1', 'p2'):
+        book.build(TippyGameState(p, n=3), 4, solver, log)
+        book.build(TippyGameState(p, n=4), 1, StrategyMinimaxMyopic(4), log)
+        for total in range(1, 101):
+            book.build(SubtractSquareState(p, current_total=total), 1,
+                       solver, log)
+    return book
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--test']:
+        import doctest
+        doctest.testmod()
+    else:
+        # python opening_book.py [PATH] [--log LOG] records the build in
+        # LOG, and running it again after a crash resumes from there.
+        args = sys.argv[1:]
+        log = None
+        if '--log' in args:
+            from solve_log import SolveLog
+            at = args.index('--log')
+            log = SolveLog(args[at + 1])
+            del args[at:at + 2]
+        path = args[0] if args else BOOK_PATH
+        try:
+            book = build_default_book(log)
+        finally:
+            if log is not None:
+                log.close()
+        book.save(path)
+        print('{} positions written to {}'.format(len(book), path))
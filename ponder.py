@@ -0,0 +1,115 @@
+import threading
+from search_control import SearchCancelled, SearchControl
+
+
+class Ponderer:
+    """ Think on the human's time.
+
+    While the human chooses a move, a background thread works through
+    the human's moves, most promising for the human first, and asks
+    strategy for its answer to each.  Once the human moves, the answer
+    to that move is often already known; if it is not, whatever table
+    strategy keeps has at least been filled along the way.  Stopping
+    cancels the search under way, so the thread never holds up the
+    computer's own move.
+
+    strategy: Strategy       -- strategy answering the human's moves
+    answers: dict of {(str, str): Move} -- answer found for each position
+                                reached by a human move, by the same key
+                                StrategyMinimaxMemoize uses
+    control: SearchControl   -- cancels the pondering under way
+    """
+
+    def __init__(self, strategy):
+        """(Ponderer, Strategy) -> NoneType
+
+        Initialize self to ponder with strategy.
+
+        >>> from strategy_random import StrategyRandom
+        >>> Ponderer(StrategyRandom()).answers
+        {}
+        """
+
+        self.strategy = strategy
+        self.answers = {}
+        self.thread = None
+        self.control = SearchControl()
+
+    def __repr__(self):
+        """(Ponderer) -> str
+
+        Return a string representation of self.
+
+        >>> from strategy_minimax_prune import StrategyMinimaxPrune
+        >>> Ponderer(StrategyMinimaxPrune())
+        Ponderer(StrategyMinimaxPrune())
+        """
+
+        return 'Ponderer({})'.format(repr(self.strategy))
+
+    def start(self, state):
+        """(Ponderer, GameState) -> NoneType
+
+        Start pondering the replies to the human's moves from state,
+        where the human is about to move.
+        """
+
+        self.stop()
+        self.answers = {}
+        self.control = SearchControl()
+        self.thread = threading.Thread(target=self.ponder, args=(state,),
+                                       daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """(Ponderer) -> NoneType
+
+        Stop pondering, cancelling the search under way.
+        """
+
+        if self.thread is not None:
+            self.control.cancel()
+            self.thread.join()
+            self.thread = None
+
+    def ponder(self, state):
+        """(Ponderer, GameState) -> NoneType
+
+        Record the strategy's answer to each of the human's moves from
+        state, until told to stop.  The human is guessed to prefer moves
+        leaving the computer with the worst rough outcome.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> from strategy_minimax_prune import StrategyMinimaxPrune
+        >>> ponderer = Ponderer(StrategyMinimaxPrune())
+        >>> ponderer.ponder(SubtractSquareState('p1', current_total=10))
+        >>> ponderer.answer(SubtractSquareState('p2', current_total=9))
+        SubtractSquareMove(9)
+        """
+
+        replies = [state.apply_move(move)
+                   for move in state.possible_next_moves()]
+        replies.sort(key=lambda reply: reply.rough_outcome())
+        for reply in replies:
+            if self.control.cancelled:
+                return
+            if reply.possible_next_moves():
+                try:
+                    move = self.strategy.suggest_move(reply, self.control)
+                except SearchCancelled:
+                    return
+                self.answers[(str(reply), reply.next_player)] = move
+
+    def answer(self, state):
+        """(Ponderer, GameState) -> Move
+
+        Return the answer found for state while pondering, or None if
+        there is none.
+        """
+
+        return self.answers.get((str(state), state.next_player))
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,44 @@
+from importlib import import_module
+
+# The games and strategies on offer, by the letters game_view.py asks for.
+# Each is named by its module and class, and only imported once chosen,
+# so starting up does not pay for the ones nobody picks.
+GAMES = {'s': ('subtract_square_state', 'SubtractSquareState'),
+         't': ('tippy_game_state', 'TippyGameState')}
+STRATEGIES = {'r': ('strategy_random', 'StrategyRandom'),
+              'm': ('strategy_minimax', 'StrategyMinimax'),
+              'mm': ('strategy_minimax_memoize', 'StrategyMinimaxMemoize'),
+              'mp': ('strategy_minimax_prune', 'StrategyMinimaxPrune'),
+              'mpy': ('strategy_minimax_myopic', 'StrategyMinimaxMyopic'),
+              'a': ('strategy_adaptive', 'StrategyAdaptive')}
+
+
+def load_game(key):
+    """(str) -> GameState.__class__
+
+    Return the game state class registered under key in GAMES.
+
+    >>> load_game('s')
+    <class 'subtract_square_state.SubtractSquareState'>
+    """
+
+    module, name = GAMES[key]
+    return getattr(import_module(module), name)
+
+
+def load_strategy(key):
+    """(str) -> Strategy.__class__
+
+    Return the strategy class registered under key in STRATEGIES.
+
+    >>> load_strategy('mpy')
+    <class 'strategy_minimax_myopic.StrategyMinimaxMyopic'>
+    """
+
+    module, name = STRATEGIES[key]
+    return getattr(import_module(module), name)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,123 @@
+import threading
+
+
+class SearchCancelled(Exception):
+    """ Raised inside a search by SearchControl.checkpoint once the search
+    has been cancelled. """
+
+
+def fallback_move(state):
+    """(GameState) -> Move
+
+    Return the tactical move of state leaving the opponent the worst
+    rough outcome: the move to play when a search is cancelled before
+    finding any.
+
+    >>> from subtract_square_state import SubtractSquareState
+    >>> fallback_move(SubtractSquareState('p1', current_total=10))
+    SubtractSquareMove(4)
+    """
+
+    return min(state.tactical_moves(),
+               key=lambda move: state.apply_move(move).rough_outcome())
+
+
+class SearchControl:
+    """ A handle on a search under way, given to suggest_move: another
+    thread may cancel the search through it, and the search reports its
+    progress through it.
+
+    The search calls checkpoint once every CHECK_EVERY positions, so the
+    cost to the search is one test of a counter per position.
+
+    progress: function -- called with the positions searched so far, the
+                          depth being searched and the best score and
+                          move known so far, at each checkpoint; or None
+    event: Event -- set once the search is to stop; any object with set
+                    and is_set methods will do, such as an Event shared
+                    with another process
+    depth: int -- depth being searched, if the search has depths
+    best: list of float and Move -- best score and move known so far, or
+                                    None
+    """
+
+    # Positions searched between checkpoints.
+    CHECK_EVERY = 1024
+
+    def __init__(self, progress=None, event=None):
+        """(SearchControl, function, Event) -> NoneType
+
+        Initialize self to report to progress, if given, and to cancel
+        by setting event, or a new threading.Event if none is given.
+
+        >>> control = SearchControl()
+        >>> control.cancelled
+        False
+        """
+
+        self.progress = progress
+        self.event = threading.Event() if event is None else event
+        self.depth = None
+        self.best = None
+
+    def __repr__(self):
+        """(SearchControl) -> str
+
+        Return a string representation of self.
+
+        >>> SearchControl()
+        SearchControl(cancelled=False)
+        """
+
+        return 'SearchControl(cancelled={})'.format(self.cancelled)
+
+    @property
+    def cancelled(self):
+        """(SearchControl) -> bool
+
+        Return whether the search has been cancelled.
+        """
+
+        return self.event.is_set()
+
+    def cancel(self):
+        """(SearchControl) -> NoneType
+
+        Cancel the search, which stops at its next checkpoint.
+
+        >>> control = SearchControl()
+        >>> control.cancel()
+        >>> control.cancelled
+        True
+        """
+
+        self.event.set()
+
+    def checkpoint(self, nodes):
+        """(SearchControl, int) -> NoneType
+
+        Report that nodes positions have been searched so far, and raise
+        SearchCancelled if the search has been cancelled.
+
+        >>> seen = []
+        >>> control = SearchControl(lambda *args: seen.append(args))
+        >>> control.checkpoint(1024)
+        >>> seen
+        [(1024, None, None)]
+        >>> control.cancel()
+        >>> control.checkpoint(2048)  # doctest: +IGNORE_EXCEPTION_DETAIL
+        Traceback (most recent call last):
+        ...
+        search_control.SearchCancelled: search cancelled after 2048 positions
+        """
+
+        if self.event.is_set():
+            raise SearchCancelled(
+                'search cancelled after {} positions'.format(nodes))
+        if self.progress is not None:
+            self.progress(nodes, self.depth, self.best)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
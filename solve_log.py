@@ -0,0 +1,219 @@
+import os
+import signal
+import sys
+import time
+
+
+class SolveLog:
+    """ A file of the results of a long solve, written as they are found,
+    so that a solve stopped part way, by a crash or by its machine being
+    taken away, can be resumed where it left off.
+
+    The file is only ever appended to.  Each line is one record: a kind,
+    a key and a value, separated by spaces, where the key is a position
+    as written by GameState.to_notation.  Records are written out every
+    interval seconds and when the log is closed.  A last line cut short
+    by a crash is dropped when the log is opened again.
+
+    path: str -- the file
+    interval: float -- seconds between writes to the file
+    records: dict of {str: dict of {str: str}} -- the value of each key,
+                                                  by kind, of the records
+                                                  read from the file when
+                                                  it was opened
+    """
+
+    def __init__(self, path, interval=60.0):
+        """(SolveLog, str, float) -> NoneType
+
+        Initialize self to the log in the file at path, reading the
+        records already there, and writing new ones every interval
+        seconds.
+
+        >>> import tempfile
+        >>> path = os.path.join(tempfile.mkdtemp(), 'solve.log')
+        >>> log = SolveLog(path)
+        >>> log.add('score', 'p1:2', '-1.0')
+        >>> log.close()
+        >>> with open(path, 'a') as log_file:
+        ...     count = log_file.write('score p2:1 1.')
+        >>> SolveLog(path).records
+        {'score': {'p1:2': '-1.0'}}
+        """
+
+        self.path, self.interval = path, interval
+        self.records = {}
+        self.pending = []
+        if os.path.exists(path):
+            with open(path, 'rb') as log_file:
+                data = log_file.read()
+            end = data.rfind(b'\n') + 1
+            for line in data[:end].decode().splitlines():
+                kind, key, value = line.split()
+                self.records.setdefault(kind, {})[key] = value
+            if end < len(data):
+                with open(path, 'r+b') as log_file:
+                    log_file.truncate(end)
+        self.file = open(path, 'a')
+        self.written = time.time()
+
+    def __repr__(self):
+        """(SolveLog) -> str
+
+        Return a string representation of self.
+        """
+
+        return 'SolveLog({})'.format(repr(self.path))
+
+    def kind(self, kind):
+        """(SolveLog, str) -> dict of {str: str}
+
+        Return the value of each key recorded of kind kind.
+        """
+
+        return self.records.get(kind, {})
+
+    def add(self, kind, key, value):
+        """(SolveLog, str, str, str) -> NoneType
+
+        Record value for key, of kind kind, writing out the records added
+        so far if interval seconds have passed since the last write.  The
+        record is not kept in self.records, as whoever adds it keeps what
+        it needs of it.
+
+        >>> import tempfile
+        >>> log = SolveLog(os.path.join(tempfile.mkdtemp(), 'solve.log'))
+        >>> log.add('score', 'p1:2', '-1.0')
+        >>> log.records
+        {}
+        >>> log.close()
+        """
+
+        self.pending.append('{} {} {}\n'.format(kind, key, value))
+        if time.time() - self.written >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """(SolveLog) -> NoneType
+
+        Write the records added since the last write to the disk.
+        """
+
+        self.file.write(''.join(self.pending))
+        self.pending = []
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.written = time.time()
+
+    def close(self):
+        """(SolveLog) -> NoneType
+
+        Write any records not yet written, and close the file.
+        """
+
+        self.flush()
+        self.file.close()
+
+
+class LoggedTable(dict):
+    """ Exact scores, by position notation, for StrategyMinimaxMemoize to
+    use as its state_holder in a long solve.  The table starts with the
+    scores already in its SolveLog, taking them out of its records so that
+    they are held once, and records each score added to it there, as kind
+    score.
+
+    log: SolveLog -- where the scores are recorded
+    """
+
+    def __init__(self, log):
+        """(LoggedTable, SolveLog) -> NoneType
+
+        Initialize self to the scores recorded in log.
+        """
+
+        dict.__init__(self, ((key, float(value))
+                             for key, value in
+                             log.records.pop('score', {}).items()))
+        self.log = log
+
+    def __setitem__(self, key, value):
+        """(LoggedTable, str, float) -> NoneType
+
+        Set the score of key to value, and record it in self.log.
+        """
+
+        dict.__setitem__(self, key, value)
+        self.log.add('score', key, repr(value))
+
+
+def solve(state, path, interval=60.0, report=None):
+    """(GameState, str, float, function) -> list of float and Move
+
+    Return the score of state for its next player, searched to the end
+    of the game by StrategyMinimaxMemoize, and the best move, or None if
+    the game is over.  The scores found are kept in the SolveLog at path,
+    so that solving again after a crash starts from them, and the answer
+    too, so that solving a solved position again returns it at once.
+    report, if given, is called with the positions searched and the size
+    of the table, every few thousand positions.
+
+    >>> import tempfile
+    >>> from subtract_square_state import SubtractSquareState
+    >>> path = os.path.join(tempfile.mkdtemp(), 'solve.log')
+    >>> solve(SubtractSquareState('p1', current_total=30), path)
+    [1.0, SubtractSquareMove(25)]
+    >>> solve(SubtractSquareState('p1', current_total=30), path)
+    [1.0, SubtractSquareMove(25)]
+    """
+
+    from search_control import SearchControl
+    from strategy_minimax_memoize import StrategyMinimaxMemoize
+
+    log = SolveLog(path, interval)
+    try:
+        key = state.to_notation()
+        solved = log.kind('solved').get(key)
+        if solved is not None:
+            score, text = solved.split(',', 1)
+            move = None if text == '-' else state.parse_move(text)
+            return [float(score), move]
+        table = LoggedTable(log)
+        control = None
+        if report is not None:
+            control = SearchControl(
+                lambda nodes, depth, best: report(nodes, len(table)))
+        score, move = StrategyMinimaxMemoize(
+            state_holder=table).best_move(state, control=control)
+        text = '-' if move is None else state.format_move(move)
+        log.add('solved', key, '{},{}'.format(score, text))
+        return [score, move]
+    finally:
+        log.close()
+
+
+if __name__ == '__main__':
+    if sys.argv[1:] == ['--test']:
+        import doctest
+        doctest.testmod()
+    elif len(sys.argv) != 4 or sys.argv[1] not in ('tippy', 'subtract'):
+        print('usage: python solve_log.py tippy|subtract N LOG')
+    else:
+        from registry import load_game
+        if sys.argv[1] == 'tippy':
+            root = load_game('t')('p1', n=int(sys.argv[2]))
+        else:
+            root = load_game('s')('p1', current_total=int(sys.argv[2]))
+        # A machine taken away first sends SIGTERM: leave through the
+        # finally clause of solve, which writes out the records pending.
+        signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(1))
+        reported = [time.time()]
+
+        def report(nodes, entries):
+            if time.time() - reported[0] >= 10:
+                reported[0] = time.time()
+                print('{} positions searched, {} scores'.format(nodes,
+                                                                entries))
+
+        score, move = solve(root, sys.argv[3], report=report)
+        print('score {} move {}'.format(
+            score, '-' if move is None else root.format_move(move)))
@@ -0,0 +1,161 @@
+# The search shared by the minimax strategies.  It keeps its own stack of
+# positions instead of calling itself once per move, so games longer than
+# Python's recursion limit can be searched to the end.
+
+
+def negamax(state, moves=None, alpha=-1.0, beta=1.0, prune=True,
+            table=None, key=None, control=None):
+    """(GameState, list of Move, float, float, bool, dict, function,
+        SearchControl) -> list of float and Move
+
+    Return the score of state for its next player, searched to the end of
+    the game, and the first move found reaching it, or None if the game
+    is over.  Only moves are tried at state, if given, and search_moves
+    everywhere else.
+
+    If prune, stop searching a position once its score reaches beta, the
+    most the opponent allows, since the opponent would avoid it; scores
+    at or below alpha are no better than one already guaranteed.  Scores
+    of positions cut short are then only bounds, but the score and move
+    returned for state are exact when they lie between alpha and beta.
+
+    If table is given, key(position) is looked up in it before searching
+    a position below state, and its exact score is stored there after.
+    Use table only without prune.
+
+    If control is given, its checkpoint is called every
+    control.CHECK_EVERY positions, raising SearchCancelled once control
+    is cancelled, and control.best is kept up to date with the best
+    score and move found for state.
+
+    >>> from subtract_square_state import SubtractSquareState
+    >>> negamax(SubtractSquareState('p1', current_total=10))
+    [-1.0, SubtractSquareMove(9)]
+    >>> negamax(SubtractSquareState('p1', current_total=3000), prune=False,
+    ...         table={}, key=lambda s: s.current_total)
+    [1.0, SubtractSquareMove(400)]
+    >>> from search_control import SearchControl
+    >>> control = SearchControl()
+    >>> control.cancel()
+    >>> negamax(SubtractSquareState('p1', current_total=3000),
+    ...         control=control)  # doctest: +IGNORE_EXCEPTION_DETAIL
+    Traceback (most recent call last):
+    ...
+    SearchCancelled: search cancelled after 1024 positions
+    """
+
+    # Each frame: position, its moves, index of the next move to try,
+    # best score and move so far, alpha and beta.
+    if moves is None:
+        moves = state.search_moves()
+    if not moves:
+        return [state.outcome(), None]
+    stack = [[state, moves, 0, None, None, alpha, beta]]
+    # score of the position just left, for its own next player
+    result = None
+    nodes = 0
+    while True:
+        frame = stack[-1]
+        if result is not None:
+            score = -result
+            result = None
+            if frame[3] is None or frame[3] < score:
+                frame[3], frame[4] = score, frame[1][frame[2] - 1]
+                frame[5] = max(frame[5], score)
+                if control is not None and len(stack) == 1:
+                    control.best = [frame[3], frame[4]]
+            if prune and frame[3] >= frame[6]:
+                frame[2] = len(frame[1])
+
+        if frame[2] < len(frame[1]):
+            child = frame[0].apply_move(frame[1][frame[2]])
+            frame[2] += 1
+            nodes += 1
+            if control is not None and not nodes % control.CHECK_EVERY:
+                control.checkpoint(nodes)
+            if table is not None:
+                result = table.get(key(child))
+                if result is not None:
+                    continue
+            child_moves = child.search_moves()
+            if child_moves:
+                stack.append([child, child_moves, 0, None, None,
+                              -frame[6], -frame[5]])
+            else:
+                result = child.outcome()
+                if table is not None:
+                    table[key(child)] = result
+            continue
+
+        stack.pop()
+        if not stack:
+            return [frame[3], frame[4]]
+        result = frame[3]
+        if table is not None:
+            table[key(frame[0])] = result
+
+
+def rank_moves(state, search, moves=None, k=None):
+    """(GameState, function, list of Move, int)
+                                      -> list of list of float, Move and bool
+
+    Return [score, move, exact] for each of moves, or of all the moves
+    possible from state if moves is None, best first, where score is the
+    score of state for its next player when move is played.
+    search(child, alpha, beta) must return the score of child for its own
+    next player, exact when it lies between alpha and beta, and no better
+    than alpha or no worse than beta otherwise, as negamax does.
+
+    Every score is exact if k is None.  Otherwise only the best k are
+    sure to be: moves are tried most promising first, and each is
+    searched only far enough to tell whether it beats the k-th best exact
+    score found so far.  A move that does not gets the most it can score,
+    and exact False.  Raise ValueError if k is less than 1.
+
+    >>> from subtract_square_state import SubtractSquareState
+    >>> search = lambda child, alpha, beta: negamax(child, alpha=alpha,
+    ...                                             beta=beta)[0]
+    >>> rank_moves(SubtractSquareState('p1', current_total=14), search)
+    [[1.0, SubtractSquareMove(9), True], [1.0, SubtractSquareMove(4), \
+True], [-1.0, SubtractSquareMove(1), True]]
+    >>> rank_moves(SubtractSquareState('p1', current_total=14), search, k=1)
+    [[1.0, SubtractSquareMove(9), True], [1.0, SubtractSquareMove(4), \
+False], [1.0, SubtractSquareMove(1), False]]
+    >>> rank_moves(SubtractSquareState('p1', current_total=14), search, k=0)
+    Traceback (most recent call last):
+    ...
+    ValueError: k must be at least 1, not 0
+    """
+
+    if k is not None and k < 1:
+        raise ValueError('k must be at least 1, not {}'.format(k))
+    if moves is None:
+        moves = state.possible_next_moves()
+    children = [(move, state.apply_move(move)) for move in moves]
+    if k is not None:
+        children.sort(key=lambda child: child[1].rough_outcome())
+    ranked = []
+    best = []
+    for move, child in children:
+        bound = -1.0
+        if k is not None and len(best) >= k:
+            bound = best[k - 1]
+        if bound == 1.0:
+            # Nothing can beat a win, so there is nothing to search for:
+            # searching with no room between alpha and beta would stop
+            # at the first move everywhere.
+            ranked.append([bound, move, False])
+            continue
+        score = -search(child, -1.0, -bound)
+        exact = bound == -1.0 or score > bound
+        if exact:
+            best.append(score)
+            best.sort(reverse=True)
+        ranked.append([score, move, exact])
+    ranked.sort(key=lambda entry: (-entry[0], not entry[2]))
+    return ranked
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
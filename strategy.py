@@ -1,3 +1,15 @@
+import time
+
+
+def _analyze_chunk(strategy, states):
+    '''(Strategy, list of GameState) -> list of list of float and Move
+
+    Return strategy.analyze_batch(states).  Runs inside a worker process
+    of Strategy.analyze_batch.
+    '''
+    return strategy.analyze_batch(states)
+
+
 class Strategy:
     '''Interface to suggest moves for a GameState.
 
@@ -11,9 +23,103 @@ class Strategy:
         Create new Strategy (self), prompt user if interactive.
         '''
 
-    def suggest_move(self, state):
-        '''(Strategy, GameState) -> Move
+    def suggest_move(self, state, control=None):
+        '''(Strategy, GameState, SearchControl) -> Move
 
-        Suggest a next move for state.
+        Suggest a next move for state.  A strategy that searches checks
+        in with control, if given, every so often: see SearchControl.
         '''
         raise NotImplementedError('Must be implemented in subclass')
+
+    def iter_suggestions(self, state, control=None):
+        '''(Strategy, GameState, SearchControl)
+                                      -> iterator of (int, Move, float, dict)
+
+        Yield the depth searched, the move suggested for state, its score
+        and figures about the search, each time the suggestion improves,
+        so that the caller may play the latest whenever it must.  The
+        figures include 'time', the seconds since the start.  Strategies
+        that search in one go yield once, with depth and score None; none
+        are yielded if the game is over.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> from strategy_random import StrategyRandom
+        >>> state = SubtractSquareState('p1', current_total=1)
+        >>> [suggestion[:3] for suggestion in
+        ...  StrategyRandom().iter_suggestions(state)]
+        [(None, SubtractSquareMove(1), None)]
+        '''
+        if state.over:
+            return
+        start = time.time()
+        move = self.suggest_move(state, control)
+        yield (None, move, None, {'time': time.time() - start})
+
+    def analyze(self, state):
+        '''(Strategy, GameState) -> list of float and Move
+
+        Return the score of state for its next player, or None if self
+        cannot score it, and the move suggested for state, or None if the
+        game is over.  Strategies that search override this to return
+        the score their search finds.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> from strategy_random import StrategyRandom
+        >>> state = SubtractSquareState('p1', current_total=1)
+        >>> StrategyRandom().analyze(state)
+        [None, SubtractSquareMove(1)]
+        '''
+        if state.over:
+            return [state.outcome(), None]
+        return [None, self.suggest_move(state)]
+
+    def analyze_batch(self, states, workers=1):
+        '''(Strategy, list of GameState, int) -> list of list of float and Move
+
+        Return analyze of each of states, in the same order.  Equivalent
+        states are analyzed once.  States with the fewest moves left are
+        analyzed first, since they are most often reached again from the
+        others, so whatever table self keeps is filled by the time the
+        others are searched.  If workers is more than 1, the states are
+        dealt out in turn to that many runs, so that each run gets its
+        share of the largest, and each run is analyzed by a copy of self
+        in a process of its own.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> from strategy_minimax_memoize import StrategyMinimaxMemoize
+        >>> states = [SubtractSquareState('p1', current_total=total)
+        ...           for total in (40, 10, 40)]
+        >>> StrategyMinimaxMemoize(state_holder={}).analyze_batch(states)
+        [[1.0, SubtractSquareMove(25)], [-1.0, SubtractSquareMove(4)], \
+[1.0, SubtractSquareMove(25)]]
+        '''
+        unique = {}
+        for state in states:
+            unique.setdefault(state.to_bytes(), state)
+        order = sorted(unique,
+                       key=lambda key: len(unique[key].possible_next_moves()))
+
+        if workers > 1 and len(order) > 1:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            runs = [order[i::workers]
+                    for i in range(min(workers, len(order)))]
+            with ProcessPoolExecutor(
+                    len(runs),
+                    mp_context=multiprocessing.get_context('spawn')) as pool:
+                results = pool.map(_analyze_chunk, [self] * len(runs),
+                                   [[unique[key] for key in run]
+                                    for run in runs])
+                analyses = {}
+                for run, result in zip(runs, results):
+                    analyses.update(zip(run, result))
+        else:
+            analyses = {}
+            for key in order:
+                analyses[key] = self.analyze(unique[key])
+        return [analyses[state.to_bytes()] for state in states]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
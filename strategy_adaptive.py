@@ -0,0 +1,228 @@
+import time
+from collections import deque
+from strategy import Strategy
+from strategy_minimax_memoize import StrategyMinimaxMemoize
+from strategy_minimax_myopic import StrategyMinimaxMyopic
+from strategy_minimax_prune import StrategyMinimaxPrune
+
+
+class StrategyAdaptive(Strategy):
+    """ Interface to suggest moves with whichever search is expected to
+    answer fastest within a time limit, judged by a model of what each
+    search costs.
+
+    The searches, in the order they are considered:
+
+        table  -- Minimax Myopic one move deep, when the outcome of every
+                  position one move on is already known
+        exact  -- Minimax Prune to the end of the game
+        memo   -- Minimax Memoize to the end of the game
+        myopic -- Minimax Myopic as many moves deep as fits the limit,
+                  and at least one
+
+    The positions a search visits are predicted from the search_size and
+    positions_left of the state, and its time from the positions each
+    kind of search has been seen to get through per second in the same
+    game.  Every search is timed, and moves the rate of its kind part of
+    the way toward the one it showed.
+
+    limit: float -- seconds a move should take at most
+    rates: dict of {(str, str): float} -- positions searched per second,
+                                          by game class name and kind of
+                                          search
+    records: deque of (str, str, float, float) -- the game class name,
+                                                  kind of search,
+                                                  predicted seconds and
+                                                  actual seconds of each
+                                                  of the last RECORDS
+                                                  searches
+    """
+
+    # Positions searched per second, before any search has been timed.
+    RATE = 20000.0
+    # Alpha-beta visits about size ** PRUNING positions of a tree of size
+    # positions: the exponent is 1 with no cut-offs and 0.5 at best.
+    PRUNING = 0.75
+    # How far each timed search moves its rate toward the one it showed.
+    LEARNING = 0.5
+    # Searches quicker than this many seconds are too noisy to learn from.
+    SHORTEST = 0.001
+    # Searches kept in records, which must not grow without end in a
+    # long-running engine or server.
+    RECORDS = 1000
+
+    def __init__(self, interactive=False, limit=1.0):
+        """(StrategyAdaptive, bool, float) -> NoneType
+
+        Initialize self to take at most about limit seconds a move.
+
+        >>> adaptive = StrategyAdaptive(limit=0.5)
+        >>> adaptive.limit, list(adaptive.records)
+        (0.5, [])
+        """
+
+        self.limit = limit
+        self.rates = {}
+        self.records = deque(maxlen=StrategyAdaptive.RECORDS)
+        self.strategies = {'exact': StrategyMinimaxPrune(),
+                           'memo': StrategyMinimaxMemoize(state_holder={}),
+                           'myopic': StrategyMinimaxMyopic(1)}
+        self.strategies['table'] = self.strategies['myopic']
+
+        if interactive:
+            seconds = ''
+            while not seconds.replace('.', '', 1).isdigit():
+                seconds = input('Please enter the number of seconds the ' +
+                                'computer may take for each move: ')
+            self.limit = float(seconds)
+
+    def __repr__(self):
+        """(StrategyAdaptive) -> str
+
+        Return a string representation of self that produces an
+        equivalent StrategyAdaptive when evaluated in Python.
+
+        >>> StrategyAdaptive(limit=2.0)
+        StrategyAdaptive(limit=2.0)
+        """
+
+        return 'StrategyAdaptive(limit={})'.format(repr(self.limit))
+
+    def __eq__(self, other):
+        """(StrategyAdaptive, object) -> bool
+
+        Return whether self is equivalent to other.
+
+        >>> StrategyAdaptive(limit=1.0) == StrategyAdaptive(limit=2.0)
+        False
+        """
+
+        return (isinstance(other, StrategyAdaptive) and
+                self.limit == other.limit)
+
+    def choose(self, state):
+        """(StrategyAdaptive, GameState) -> (str, int, float)
+
+        Return the kind of search to make from state, how many moves deep
+        if it is myopic or table, and the seconds it is predicted to take.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> from tippy_game_state import TippyGameState
+        >>> adaptive = StrategyAdaptive()
+        >>> adaptive.choose(SubtractSquareState('p1', current_total=500))[:2]
+        ('memo', None)
+        >>> adaptive.choose(TippyGameState('p1', n=3))[:2]
+        ('exact', None)
+        >>> adaptive.choose(TippyGameState('p1', n=5))[:2]
+        ('myopic', 4)
+        """
+
+        game = type(state).__name__
+        rate = {}
+        for kind in ('table', 'exact', 'memo', 'myopic'):
+            rate[kind] = self.rates.get((game, kind), StrategyAdaptive.RATE)
+
+        moves = state.possible_next_moves()
+        if all(state.apply_move(move).outcome_known() for move in moves):
+            return ('table', 1, len(moves) / rate['table'])
+
+        costs = {'exact': (state.search_size() ** StrategyAdaptive.PRUNING /
+                           rate['exact']),
+                 'memo': state.positions_left() * len(moves) / rate['memo']}
+        kind = min(costs, key=costs.get)
+        if costs[kind] <= self.limit:
+            return (kind, None, costs[kind])
+
+        depth, size = 1, state.search_size(1)
+        while True:
+            deeper = state.search_size(depth + 1)
+            if (deeper == size or deeper ** StrategyAdaptive.PRUNING /
+                    rate['myopic'] > self.limit):
+                break
+            depth, size = depth + 1, deeper
+        return ('myopic', depth,
+                size ** StrategyAdaptive.PRUNING / rate['myopic'])
+
+    def record(self, game, kind, predicted, seconds):
+        """(StrategyAdaptive, str, str, float, float) -> NoneType
+
+        Record that a search of kind kind in the game whose class is named
+        game, predicted to take predicted seconds, took seconds, and move
+        the rate of kind in game toward the one this search showed.
+
+        >>> adaptive = StrategyAdaptive()
+        >>> adaptive.record('TippyGameState', 'exact', 1.0, 4.0)
+        >>> adaptive.rates[('TippyGameState', 'exact')]
+        10000.0
+        """
+
+        self.records.append((game, kind, predicted, seconds))
+        if seconds >= StrategyAdaptive.SHORTEST and predicted > 0:
+            # Errors in the model are by a factor, so rates are averaged
+            # geometrically.
+            rate = self.rates.get((game, kind), StrategyAdaptive.RATE)
+            self.rates[(game, kind)] = rate * ((predicted / seconds) **
+                                               StrategyAdaptive.LEARNING)
+
+    def suggest_move(self, state, control=None):
+        """(StrategyAdaptive, GameState, SearchControl) -> Move
+
+        Return a move for state found by the search chosen for it, under
+        control.  A lone tactical move of state, such as a win in one, is
+        played without searching.  A cancelled search is not recorded.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
+        >>> adaptive = StrategyAdaptive()
+        >>> state = TippyGameState('p1', 3, [['p2', None, None],\
+        ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
+        TippyMove([0, 1])], 'p1': [TippyMove([1, 2]), TippyMove([1, 1])]})
+        >>> state.all_tippies = state.find_tippies()
+        >>> adaptive.suggest_move(state)
+        TippyMove([2, 1])
+        """
+
+        moves = state.tactical_moves()
+        if len(moves) == 1:
+            return moves[0]
+        kind, depth, predicted = self.choose(state)
+        strategy = self.strategies[kind]
+        if depth is not None:
+            strategy.n = depth
+        start = time.time()
+        move = strategy.suggest_move(state, control)
+        self.record(type(state).__name__, kind, predicted,
+                    time.time() - start)
+        return move
+
+    def rank_moves(self, state, k=None):
+        """(StrategyAdaptive, GameState, int)
+                                      -> list of list of float, Move and bool
+
+        Return [score, move, exact] for every move possible from state,
+        best first, as the rank_moves of the search chosen for state
+        scores them; see stack_search.rank_moves for k.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> adaptive = StrategyAdaptive()
+        >>> adaptive.rank_moves(SubtractSquareState('p1', current_total=14))
+        [[1.0, SubtractSquareMove(9), True], [1.0, SubtractSquareMove(4), \
+True], [-1.0, SubtractSquareMove(1), True]]
+        """
+
+        kind, depth, predicted = self.choose(state)
+        strategy = self.strategies[kind]
+        if depth is not None:
+            strategy.n = depth
+        start = time.time()
+        ranked = strategy.rank_moves(state, k)
+        # Ranking costs about one search per move.
+        self.record(type(state).__name__, kind,
+                    predicted * len(state.possible_next_moves()),
+                    time.time() - start)
+        return ranked
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
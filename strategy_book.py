@@ -0,0 +1,97 @@
+from strategy import Strategy
+
+
+class StrategyBook(Strategy):
+    """ Interface to suggest moves from an opening book, falling back on
+    another strategy for positions the book does not cover. """
+
+    def __init__(self, book, fallback, interactive=False):
+        """(StrategyBook, OpeningBook, Strategy, bool) -> NoneType
+
+        Initialize self to play the moves in book, and those of fallback
+        elsewhere.
+
+        >>> from opening_book import OpeningBook
+        >>> from strategy_random import StrategyRandom
+        >>> strategy = StrategyBook(OpeningBook(), StrategyRandom())
+        >>> len(strategy.book)
+        0
+        """
+
+        self.book, self.fallback = book, fallback
+
+    def __repr__(self):
+        """(StrategyBook) -> str
+
+        Return a string representation of self.
+
+        >>> from opening_book import OpeningBook
+        >>> from strategy_minimax_prune import StrategyMinimaxPrune
+        >>> StrategyBook(OpeningBook(), StrategyMinimaxPrune())
+        StrategyBook(OpeningBook({}), StrategyMinimaxPrune())
+        """
+
+        return 'StrategyBook({}, {})'.format(repr(self.book),
+                                             repr(self.fallback))
+
+    def __eq__(self, other):
+        """(StrategyBook, object) -> bool
+
+        Return whether self is equivalent to other.
+        """
+
+        return (isinstance(other, StrategyBook) and
+                self.book.moves == other.book.moves and
+                self.fallback == other.fallback)
+
+    def suggest_move(self, state, control=None):
+        """(StrategyBook, GameState, SearchControl) -> Move
+
+        Return the book move for state, if the book has a legal one, or
+        else the move suggested by the fallback strategy, searching under
+        control.
+
+        >>> from opening_book import OpeningBook
+        >>> from strategy_minimax_prune import StrategyMinimaxPrune
+        >>> from subtract_square_state import SubtractSquareState
+        >>> strategy = StrategyBook(OpeningBook({'p1:8': '1'}),
+        ...                         StrategyMinimaxPrune())
+        >>> strategy.suggest_move(SubtractSquareState('p1', current_total=8))
+        SubtractSquareMove(1)
+        >>> strategy.suggest_move(SubtractSquareState('p1', current_total=9))
+        SubtractSquareMove(9)
+        """
+
+        move = self.book.lookup(state)
+        if move is not None and move in state.possible_next_moves():
+            return move
+        return self.fallback.suggest_move(state, control)
+
+    def iter_suggestions(self, state, control=None):
+        """(StrategyBook, GameState, SearchControl)
+                                      -> iterator of (int, Move, float, dict)
+
+        Yield the book move for state, if the book has a legal one, at
+        depth 0, or else the suggestions of the fallback strategy.
+
+        >>> from opening_book import OpeningBook
+        >>> from strategy_minimax_prune import StrategyMinimaxPrune
+        >>> from subtract_square_state import SubtractSquareState
+        >>> strategy = StrategyBook(OpeningBook({'p1:8': '1'}),
+        ...                         StrategyMinimaxPrune())
+        >>> state = SubtractSquareState('p1', current_total=8)
+        >>> list(strategy.iter_suggestions(state))
+        [(0, SubtractSquareMove(1), None, {'time': 0.0})]
+        """
+
+        move = self.book.lookup(state)
+        if move is not None and move in state.possible_next_moves():
+            yield (0, move, None, {'time': 0.0})
+        else:
+            for suggestion in self.fallback.iter_suggestions(state, control):
+                yield suggestion
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,6 +1,5 @@
-from tippy_game_state import TippyGameState
-from tippy_move import TippyMove
 from strategy import Strategy
+from stack_search import negamax, rank_moves
 
 
 class StrategyMinimaxMemoize(Strategy):
@@ -50,12 +49,17 @@ class StrategyMinimaxMemoize(Strategy):
         return (isinstance(other, StrategyMinimaxMemoize) and
                 self.state_holder == other.state_holder)
 
-    def suggest_move(self, state):
-        """(StrategyMinimaxMemoize, GameState) -> Move
+    def suggest_move(self, state, control=None):
+        """(StrategyMinimaxMemoize, GameState, SearchControl) -> Move
 
         Return a move chosen based on the Minimax Memoize
-        algorithm from those available for state.
+        algorithm from those available for state.  A lone tactical move
+        of state, such as a win in one, is played without searching.
+        The search may be cancelled, and reports its progress, through
+        control.
 
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
         >>> minimax = StrategyMinimaxMemoize({})
         >>> state = TippyGameState('p1', 3, [['p2', None, None],\
         ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
@@ -65,16 +69,82 @@ class StrategyMinimaxMemoize(Strategy):
         TippyMove([2, 1])
         """
         
-        return self.best_move(state)[1]
+        moves = state.tactical_moves()
+        if len(moves) == 1:
+            return moves[0]
+        return self.best_move(state, moves, control)[1]
     
-    def best_move(self, state):
+    def analyze(self, state):
         """(StrategyMinimaxMemoize, GameState) -> list of float and Move
 
+        Return the score of state for its next player, searched to the end
+        of the game, and the move suggest_move plays, or None if the game
+        is over.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
+        >>> minimax = StrategyMinimaxMemoize({})
+        >>> state = TippyGameState('p1', 3, [['p2', None, None],\
+        ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
+        TippyMove([0, 1])], 'p1': [TippyMove([1, 2]), TippyMove([1, 1])]})
+        >>> state.all_tippies = state.find_tippies()
+        >>> minimax.analyze(state)
+        [1.0, TippyMove([2, 1])]
+        """
+
+        moves = state.tactical_moves()
+        if not moves:
+            return [state.outcome(), None]
+        return self.best_move(state, moves)
+
+    def rank_moves(self, state, k=None):
+        """(StrategyMinimaxMemoize, GameState, int)
+                                      -> list of list of float, Move and bool
+
+        Return [score, move, exact] for every move possible from state,
+        best first, each scored to the end of the game as best_move
+        scores it.  Positions are looked up in and added to
+        self.state_holder, as best_move does.  Since it never prunes,
+        every score is exact whatever k is; k is taken only to match the
+        other strategies.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
+        >>> minimax = StrategyMinimaxMemoize({})
+        >>> state = TippyGameState('p1', 3, [['p2', None, None],\
+        ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
+        TippyMove([0, 1])], 'p1': [TippyMove([1, 2]), TippyMove([1, 1])]})
+        >>> state.all_tippies = state.find_tippies()
+        >>> minimax.rank_moves(state)[:2]
+        [[1.0, TippyMove([2, 1]), True], [0.0, TippyMove([1, 0]), True]]
+        """
+
+        def search(child, alpha, beta):
+            key = child.to_notation()
+            if key not in self.state_holder:
+                self.state_holder[key] = self.best_move(child)[0]
+            return self.state_holder[key]
+
+        return rank_moves(state, search)
+
+    def best_move(self, state, moves=None, control=None):
+        """(StrategyMinimaxMemoize, GameState, list of Move, SearchControl)
+                                                  -> list of float and Move
+
         Apply minimax algorithm. When a game state is first encountered, 
         it is logged into the dictionary self.state_holder along with its 
         value. If the same state is subsequently encountered, the value
-        stored in the  dictionary is return instead.
-
+        stored in the  dictionary is return instead.  Only moves are
+        tried, if given, instead of all the moves possible from state.
+        The search runs on stack_search.negamax, which does not recurse,
+        so games of any length can be searched, and which checks in with
+        control, if given.  Only positions searched to the end are kept
+        in self.state_holder, so a cancelled search leaves it correct.
+        Positions are keyed by their to_notation, a single line, so that
+        a solve_log.LoggedTable can record them.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
         >>> minimax = StrategyMinimaxMemoize({})
         >>> state = TippyGameState('p1', 3, [['p2', None, None],\
         ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
@@ -84,31 +154,9 @@ class StrategyMinimaxMemoize(Strategy):
         [1.0, TippyMove([2, 1])]
         """
 
-        move_list = state.possible_next_moves()
-     
-        if not move_list:
-            return [state.outcome(), None]
-        else:
-            gather = []
-            for move in move_list:
-                new_state = state.apply_move(move)
-                if ((str(new_state), new_state.next_player) not in
-                        self.state_holder):
-                    score = (self.best_move(new_state)[0] * -1)
-                    gather.append([score, move])
-                    self.state_holder[(str(new_state),
-                                       new_state.next_player)] = (score * -1)
-
-                else:
-                    gather.append([self.state_holder[
-                        (str(new_state), new_state.next_player)] * -1, move])
-
-        move = gather[0]
-        for item in gather:
-            if move[0] < item[0]:
-                move = item
-                
-        return move
+        return negamax(state, moves, prune=False, table=self.state_holder,
+                       key=lambda position: position.to_notation(),
+                       control=control)
 
 
 if __name__ == '__main__':
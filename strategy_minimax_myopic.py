@@ -1,6 +1,6 @@
-from tippy_game_state import TippyGameState
-from tippy_move import TippyMove
+import time
 from strategy import Strategy
+from stack_search import rank_moves
 
 
 class StrategyMinimaxMyopic(Strategy):
@@ -10,17 +10,32 @@ class StrategyMinimaxMyopic(Strategy):
     # a __str__ method since StrategyMinimaxMyopic has no
     # useful attributes to display.
 
+    # Kinds of score kept in the table: the exact score of a position,
+    # or only a lower or upper bound on it, when the search of the
+    # position was cut short by alpha-beta pruning.
+    EXACT, LOWER, UPPER = 0, 1, 2
+    # The table is emptied when it grows past this many entries.
+    TABLE_LIMIT = 10 ** 6
+
     def __init__(self, n=3, interactive=False):
         """(StrategyMinimaxMyopic, int, bool) -> NoneType
 
-        Initialize self to have a number of moves to look ahead n.
+        Initialize self to have a number of moves to look ahead n, a
+        count nodes of the positions visited by best_move, and an empty
+        table of the positions searched so far.
         
         >>> minimax = StrategyMinimaxMyopic()
         >>> minimax.n
         3
+        >>> minimax.nodes
+        0
+        >>> minimax.table
+        {}
         """
         
         self.n = n
+        self.nodes = 0
+        self.table = {}
         
         if interactive:
             num = ''
@@ -56,12 +71,16 @@ class StrategyMinimaxMyopic(Strategy):
         return (isinstance(other, StrategyMinimaxMyopic) and
                 self.n == other.n)
     
-    def suggest_move(self, state):
-        """(StrategyMinimaxMyopic, GameState) -> Move
+    def suggest_move(self, state, control=None):
+        """(StrategyMinimaxMyopic, GameState, SearchControl) -> Move
 
         Return a move chosen based on the Minimax Myopic algorithm from those
-        available for state.
+        available for state.  A lone tactical move of state, such as a win
+        in one, is played without searching.  The search may be cancelled,
+        and reports its progress, through control.
 
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
         >>> minimax = StrategyMinimaxMyopic(3)
         >>> state = TippyGameState('p1', 3, [['p2', None, None],\
         ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
@@ -71,15 +90,142 @@ class StrategyMinimaxMyopic(Strategy):
         TippyMove([2, 1])
         """
         
-        return self.best_move(state, self.n)[1]
+        moves = state.tactical_moves()
+        if len(moves) == 1:
+            return moves[0]
+        if control is not None:
+            control.depth = self.n
+        return self.best_move(state, self.n, moves=moves,
+                              control=control)[1]
+
+    def iter_suggestions(self, state, control=None):
+        """(StrategyMinimaxMyopic, GameState, SearchControl)
+                                      -> iterator of (int, Move, float, dict)
+
+        Yield the best move for state and its score looking ahead 1, 2,
+        ... and at most self.n moves, each with its depth and figures
+        about the search: 'nodes', the positions searched at that depth,
+        and 'time', the seconds since the start.  Stop early once looking
+        deeper changes nothing, when the whole game tree fits within the
+        depth just searched.  Each depth tries first the best move of the
+        one before, found in self.table, so the early depths cost little.
+        A lone tactical move is yielded once, at depth 0, with score None.
+        The searches are under control, if given.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> minimax = StrategyMinimaxMyopic(3)
+        >>> state = SubtractSquareState('p1', current_total=27)
+        >>> [suggestion[:3] for suggestion in minimax.iter_suggestions(state)]
+        [(1, SubtractSquareMove(25), 1.0), (2, SubtractSquareMove(25), 1.0), \
+(3, SubtractSquareMove(25), 1.0)]
+        """
 
-    def best_move(self, state, n):
-        """(StrategyMinimaxMyopic, GameState, int) -> list of float and Move
+        start = time.time()
+        moves = state.tactical_moves()
+        if len(moves) == 1:
+            yield (0, moves[0], None, {'nodes': 0, 'time': 0.0})
+            return
+        if not moves:
+            return
+        previous = 0
+        for depth in range(1, self.n + 1):
+            before = self.nodes
+            if control is not None:
+                control.depth = depth
+            score, move = self.best_move(state, depth, moves=moves,
+                                         control=control)
+            if control is not None:
+                control.best = [score, move]
+            nodes = self.nodes - before
+            yield (depth, move, score,
+                   {'nodes': nodes, 'time': time.time() - start})
+            if nodes == previous:
+                return
+            previous = nodes
+
+    def analyze(self, state):
+        """(StrategyMinimaxMyopic, GameState) -> list of float and Move
+
+        Return the score of state for its next player, looking ahead self.n
+        moves, and the move suggest_move plays, or None if the game is
+        over.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
+        >>> minimax = StrategyMinimaxMyopic(3)
+        >>> state = TippyGameState('p1', 3, [['p2', None, None],\
+        ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
+        TippyMove([0, 1])], 'p1': [TippyMove([1, 2]), TippyMove([1, 1])]})
+        >>> state.all_tippies = state.find_tippies()
+        >>> minimax.analyze(state)
+        [1.0, TippyMove([2, 1])]
+        >>> minimax.analyze(TippyGameState.from_notation('p1:.xo/oox/.x.'))
+        [0.0, TippyMove([0, 0])]
+        """
+
+        moves = state.tactical_moves()
+        if not moves:
+            return [state.outcome(), None]
+        return self.best_move(state, self.n, moves=moves)
+
+    def rank_moves(self, state, k=None):
+        """(StrategyMinimaxMyopic, GameState, int)
+                                      -> list of list of float, Move and bool
+
+        Return [score, move, exact] for every move possible from state,
+        best first, each scored looking ahead self.n moves as best_move
+        scores it, with every move sharing self.table.  All the scores
+        are exact if k is None, and otherwise only the best k; see
+        stack_search.rank_moves.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
+        >>> minimax = StrategyMinimaxMyopic(3)
+        >>> state = TippyGameState('p1', 3, [['p2', None, None],\
+        ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
+        TippyMove([0, 1])], 'p1': [TippyMove([1, 2]), TippyMove([1, 1])]})
+        >>> state.all_tippies = state.find_tippies()
+        >>> minimax.rank_moves(state)[:2]
+        [[1.0, TippyMove([2, 1]), True], [0.0, TippyMove([1, 0]), True]]
+
+        Scoring only the best k leaves self.table as correct as a full
+        search does.
+
+        >>> state = TippyGameState.from_notation('p2:x..o/x.ox/x.../xo.o')
+        >>> minimax.rank_moves(state, 1)[0]
+        [1.0, TippyMove([2, 2]), True]
+        >>> children = [state.apply_move(move)
+        ...             for move in state.possible_next_moves()]
+        >>> ([minimax.best_move(child, 2)[0] for child in children] ==
+        ...  [StrategyMinimaxMyopic(3).best_move(child, 2)[0]
+        ...   for child in children])
+        True
+        """
+
+        return rank_moves(state, lambda child, alpha, beta: self.best_move(
+            child, max(self.n - 1, 0), alpha, beta)[0], k=k)
+
+    def best_move(self, state, n, alpha=-1.0, beta=1.0, moves=None,
+                  control=None):
+        """(StrategyMinimaxMyopic, GameState, int, float, float,
+            list of Move, SearchControl) -> list of float and Move
 
         Look ahead n moves and if game state has not ended, then best move
         should evaluate rough outcome to provide a score for that game
         state. If the game has ended, evaluate actual outcome.
+
+        Stop searching a position once its score reaches beta, the most
+        the opponent would allow, since the opponent would then avoid it;
+        scores at or below alpha are no better than one the current
+        player is already guaranteed.  The scores and best moves found
+        are kept in self.table, by position and number of moves looked
+        ahead, so that positions reached again by another order of moves
+        are not searched twice.  Only moves are tried, if given, instead
+        of all the moves possible from state.  If control is given, its
+        checkpoint is called every control.CHECK_EVERY positions.
         
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
         >>> minimax = StrategyMinimaxMyopic(3)
         >>> state = TippyGameState('p1', 3, [['p2', None, None],\
         ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
@@ -87,26 +233,65 @@ class StrategyMinimaxMyopic(Strategy):
         >>> state.all_tippies = state.find_tippies()
         >>> minimax.best_move(state, 3)
         [1.0, TippyMove([2, 1])]
+        >>> minimax.nodes
+        27
+        >>> minimax.best_move(state, 3)
+        [1.0, TippyMove([2, 1])]
+        >>> minimax.nodes
+        28
         """
         
-        move_list = state.possible_next_moves()
-
+        self.nodes += 1
+        if control is not None and not self.nodes % control.CHECK_EVERY:
+            control.checkpoint(self.nodes)
+        move_list = state.search_moves()
         if not move_list:
-            return [state.outcome(), None]
-        elif n == 0:
+            # The outcome is settled, but a legal move is still named
+            # unless the game is over.
+            move_list = (list(moves) if moves is not None
+                         else state.tactical_moves())
+            return [state.outcome(), move_list[0] if move_list else None]
+        if moves is not None:
+            move_list = list(moves)
+        if n == 0:
             return [state.rough_outcome(), None]
+
+        key = state.to_notation()
+        entry = self.table.get((key, n))
+        if entry is not None:
+            kind, score, move = entry
+            if (kind == self.EXACT or
+                    (kind == self.LOWER and score >= beta) or
+                    (kind == self.UPPER and score <= alpha)):
+                return [score, move]
         else:
-            gather = []
-            for move in move_list:
-                score = (self.best_move(state.apply_move(move), n - 1)[0] * -1)
-                gather.append([score, move])                   
-            
-            move = gather[0]              
-            for item in gather:
-                if move[0] < item[0]:
-                    move = item
-                    
-            return move
+            # The best move one move less deep is likely best again.
+            entry = self.table.get((key, n - 1))
+        if entry is not None and entry[2] in move_list:
+            move_list.remove(entry[2])
+            move_list.insert(0, entry[2])
+
+        alpha_start = alpha
+        best = None
+        for move in move_list:
+            score = (self.best_move(state.apply_move(move), n - 1,
+                                    -beta, -alpha, control=control)[0] * -1)
+            if best is None or best[0] < score:
+                best = [score, move]
+                alpha = max(alpha, score)
+                if score >= beta:
+                    break
+
+        if best[0] <= alpha_start:
+            kind = self.UPPER
+        elif best[0] >= beta:
+            kind = self.LOWER
+        else:
+            kind = self.EXACT
+        if len(self.table) >= self.TABLE_LIMIT:
+            self.table.clear()
+        self.table[(key, n)] = (kind, best[0], best[1])
+        return best
             
     
 if __name__ == '__main__':
@@ -1,6 +1,5 @@
-from tippy_game_state import TippyGameState
-from tippy_move import TippyMove
 from strategy import Strategy
+from stack_search import negamax, rank_moves
 
 
 class StrategyMinimaxPrune(Strategy):
@@ -37,12 +36,16 @@ class StrategyMinimaxPrune(Strategy):
         
         return isinstance(other, StrategyMinimaxPrune)
     
-    def suggest_move(self, state):
-        """(StrategyMinimaxPrune, GameState) -> Move
+    def suggest_move(self, state, control=None):
+        """(StrategyMinimaxPrune, GameState, SearchControl) -> Move
 
         Return a move chosen based on the Minimax Pruning algorithm from those
-        available for state.
+        available for state.  A lone tactical move of state, such as a
+        win in one, is played without searching.  The search may be
+        cancelled, and reports its progress, through control.
 
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
         >>> minimax = StrategyMinimaxPrune()
         >>> state = TippyGameState('p1', 3, [['p2', None, None],\
         ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
@@ -52,85 +55,91 @@ class StrategyMinimaxPrune(Strategy):
         TippyMove([2, 1])
         """
         
-        self.maximizer = state.next_player
-        return self.best_move(state)[1]        
+        moves = state.tactical_moves()
+        if len(moves) == 1:
+            return moves[0]
+        return self.best_move(state, moves=moves, control=control)[1]
 
-    def best_move(self, state, alpha=-1, beta=-1):
-        """(StrategyMinimaxPrune, GameState, number, number)
-                                           -> list of float and Move
+    def analyze(self, state):
+        """(StrategyMinimaxPrune, GameState) -> list of float and Move
 
-        Initialize value representing worst score for current state. Track
-        best move available to the next player and opponent in the variables
-        alpha and beta respectively. Continue maximizing score for current
-        position, but stop search when when it exceeds -1 times the score
-        we already know is gauranteed to the opponent.
+        Return the score of state for its next player, searched to the end
+        of the game, and the move suggest_move plays, or None if the game
+        is over.
 
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
         >>> minimax = StrategyMinimaxPrune()
         >>> state = TippyGameState('p1', 3, [['p2', None, None],\
         ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
         TippyMove([0, 1])], 'p1': [TippyMove([1, 2]), TippyMove([1, 1])]})
         >>> state.all_tippies = state.find_tippies()
-        >>> minimax.maximizer = state.next_player
-        >>> minimax.best_move(state)
+        >>> minimax.analyze(state)
         [1.0, TippyMove([2, 1])]
         """
-        
-        # Alpha is the current player's best encountered score on the path to
-        # the root.
-        # Beta is the opponent's best encoutered score on the path to the
-        # root.
-
-        # Initialize value as the worst possible score for this game position.
-        value = -1.0
-        move_list = state.possible_next_moves()
-        
-        # Base case
-        if not move_list:
+
+        moves = state.tactical_moves()
+        if not moves:
             return [state.outcome(), None]
-        
-        else:
-            # Initialize value as the worst possible score for this game
-            # position.
-            value = -1.0
-            gather = []
-                
-            # Current player's loop
-            if state.next_player == self.maximizer:
-                i = 0
-                while i < len(move_list) and (value < beta * -1.0):
-                    move = move_list[i]
-                    score = (self.best_move(state.apply_move(move),
-                                            alpha, beta)[0] * -1)
-                    
-                    # Track highest score
-                    value = max([score, value])
-                    alpha = max([alpha, value])
-                        
-                    gather.append([score, move])
-                    i += 1
-                    
-            # Opponent's loop 
-            else:
-                i = 0 
-                while i < len(move_list) and (value < alpha * -1.0):
-                    move = move_list[i]
-                    score = (self.best_move(state.apply_move(move),
-                                            alpha, beta)[0] * -1)
-
-                    value = max([score, value])
-                    beta = max([beta, value])
-                        
-                    gather.append([score, move])
-                    i += 1
-            
-            # Pick the highest score in gather along with the corresponding
-            # move.
-            move = gather[0]
-            for item in gather:
-                if move[0] < item[0]:
-                    move = item
-            
-            return move
+        return self.best_move(state, moves=moves)
+
+    def rank_moves(self, state, k=None):
+        """(StrategyMinimaxPrune, GameState, int)
+                                      -> list of list of float, Move and bool
+
+        Return [score, move, exact] for every move possible from state,
+        best first, each scored to the end of the game as best_move
+        scores it.  All the scores are exact if k is None, and otherwise
+        only the best k; see stack_search.rank_moves.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
+        >>> minimax = StrategyMinimaxPrune()
+        >>> state = TippyGameState('p1', 3, [['p2', None, None],\
+        ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
+        TippyMove([0, 1])], 'p1': [TippyMove([1, 2]), TippyMove([1, 1])]})
+        >>> state.all_tippies = state.find_tippies()
+        >>> minimax.rank_moves(state)[:2]
+        [[1.0, TippyMove([2, 1]), True], [0.0, TippyMove([1, 0]), True]]
+
+        Once the best k win, every other move may at most win as well.
+
+        >>> state = TippyGameState.from_notation('p2:x..o/x.ox/x.../xo.o')
+        >>> ranked = minimax.rank_moves(state, 1)
+        >>> ranked[0]
+        [1.0, TippyMove([1, 1]), True]
+        >>> [entry[0] for entry in ranked]
+        [1.0, 1.0, 1.0, 1.0, 1.0, 1.0, 1.0]
+        """
+
+        return rank_moves(state, lambda child, alpha, beta: negamax(
+            child, alpha=alpha, beta=beta)[0], k=k)
+
+    def best_move(self, state, alpha=-1, beta=-1, moves=None, control=None):
+        """(StrategyMinimaxPrune, GameState, number, number, list of Move,
+            SearchControl) -> list of float and Move
+
+        Track the best score guaranteed so far to the next player and to
+        the opponent in the variables alpha and beta respectively. Continue
+        maximizing score for current position, but stop search when it
+        exceeds -1 times the score we already know is gauranteed to the
+        opponent.  Only moves are tried, if given, instead of all the moves
+        possible from state.  The search runs on stack_search.negamax,
+        which does not recurse, so games of any length can be searched,
+        and which checks in with control, if given.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> from tippy_move import TippyMove
+        >>> minimax = StrategyMinimaxPrune()
+        >>> state = TippyGameState('p1', 3, [['p2', None, None],\
+        ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
+        TippyMove([0, 1])], 'p1': [TippyMove([1, 2]), TippyMove([1, 1])]})
+        >>> state.all_tippies = state.find_tippies()
+        >>> minimax.best_move(state)
+        [1.0, TippyMove([2, 1])]
+        """
+
+        return negamax(state, moves, alpha, -beta, control=control)
 
 
 if __name__ == '__main__':
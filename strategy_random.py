@@ -6,10 +6,11 @@ class StrategyRandom(Strategy):
     ''' Interface to suggest random moves.
     '''
 
-    def suggest_move(self, state):
-        '''(StrategyRandom, GameState) -> Move
+    def suggest_move(self, state, control=None):
+        '''(StrategyRandom, GameState, SearchControl) -> Move
 
-        Return a random move from those available for state.
+        Return a random move from those available for state.  There is no
+        search to control.
 
         Overrides Strategy.suggest_move
         '''
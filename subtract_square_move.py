@@ -1,3 +1,4 @@
+from math import isqrt
 from move import Move
 
 
@@ -5,16 +6,58 @@ class SubtractSquareMove(Move):
     ''' A move in the game of Subtract Square.
 
     amount: int -- amount to subtract from current value.
+
+    There is only ever one SubtractSquareMove for each square amount,
+    shared by every state that offers it.
     '''
 
+    __slots__ = ('amount',)
+    # The move for each square amount, once one has been asked for.
+    _moves = {}
+
+    def __new__(cls, amount):
+        ''' (SubtractSquareMove.__class__, int) -> SubtractSquareMove
+
+        Return the SubtractSquareMove for removing amount, creating it
+        the first time it is asked for.  Only squares, the only legal
+        amounts, are kept: any other amount, such as one typed by a
+        player, gets a move of its own, so that it is not kept forever.
+
+        >>> SubtractSquareMove(4) is SubtractSquareMove(4)
+        True
+        >>> SubtractSquareMove(5) is SubtractSquareMove(5)
+        False
+        '''
+        move = cls._moves.get(amount)
+        if move is None:
+            move = Move.__new__(cls)
+            move.amount = amount
+            if (isinstance(amount, int) and amount > 0 and
+                    isqrt(amount) ** 2 == amount):
+                cls._moves[amount] = move
+        return move
+
     def __init__(self, amount):
         ''' (SubtractSquareMove, int) -> NoneType
 
         Initialize a new SubtractSquareMove for removing amount from value.
+        Nothing is left to do once __new__ has found or created the move.
 
         Assume: amount is a positive integer square.
         '''
-        self.amount = amount
+
+    def __reduce__(self):
+        ''' (SubtractSquareMove) -> tuple
+
+        Return how to rebuild self, so that unpickling yields the shared
+        move for the same amount.
+
+        >>> import pickle
+        >>> m = SubtractSquareMove(9)
+        >>> pickle.loads(pickle.dumps(m)) is m
+        True
+        '''
+        return (SubtractSquareMove, (self.amount,))
 
     def __repr__(self):
         ''' (SubtractSquareMove) -> str
@@ -49,8 +92,18 @@ class SubtractSquareMove(Move):
         >>> print(m1 == m2)
         False
         '''
-        return (isinstance(other, SubtractSquareMove) and 
-                self.amount == other.amount)
+        return self is other or (isinstance(other, SubtractSquareMove) and
+                                 self.amount == other.amount)
+
+    def __hash__(self):
+        ''' (SubtractSquareMove) -> int
+
+        Return a hash of this SubtractSquareMove, equal for equal moves.
+
+        >>> hash(SubtractSquareMove(4)) == hash(SubtractSquareMove(4))
+        True
+        '''
+        return hash(self.amount)
 
 
 if __name__ == '__main__':
@@ -1,14 +1,60 @@
 from game_state import GameState
 from subtract_square_move import SubtractSquareMove
-from math import sqrt
+from bisect import bisect_right
 from random import randint
+try:
+    from math import isqrt
+except ImportError:
+    # Python before 3.8
+    def isqrt(n):
+        '''(int) -> int
+
+        Return the largest int whose square is at most n, for n >= 0.
+        '''
+        if n == 0:
+            return 0
+        x = 1 << ((n.bit_length() + 1) // 2)
+        while True:
+            y = (x + n // x) // 2
+            if y >= x:
+                return x
+            x = y
+
+# Shared by every state: SQUARES[i] is i ** 2 and MOVES[i] the move
+# removing it, for every square up to the largest total seen so far.
+SQUARES = [0]
+MOVES = [None]
+
+
+def extend_squares(total):
+    '''(int) -> NoneType
+
+    Make SQUARES and MOVES reach at least as far as total.
+
+    >>> extend_squares(10)
+    >>> SQUARES[:5]
+    [0, 1, 4, 9, 16]
+    '''
+    while SQUARES[-1] < total:
+        i = len(SQUARES)
+        SQUARES.append(i * i)
+        MOVES.append(SubtractSquareMove(i * i))
 
 
 class SubtractSquareState(GameState):
     ''' The state of a Subtract Square game
 
     current_total: int   --- total to be subtracted from
+    outcome_table: OutcomeTable --- class attribute; if set, rough_outcome
+                                    looks up the exact outcome of totals
+                                    it covers
     '''
+    outcome_table = None
+    instructions = ('On your turn, you may remove any number so long '
+                    'as it is (a) a perfect square, and '
+                    '(b) no more than the current number.')
+    # _rough: rough_outcome, once worked out
+    __slots__ = ('current_total', '_rough')
 
     def __init__(self, p, interactive=False, current_total=0):
         ''' (SubtractSquareState, int, str) -> NoneType
@@ -23,9 +69,7 @@ class SubtractSquareState(GameState):
             current_total = randint(1, int(input('Maximum starting value? ')))
         GameState.__init__(self, p)
         self.current_total = current_total
-        self.instructions = ('On your turn, you may remove any number so long '
-                             'as it is (a) a perfect square, and '
-                             '(b) no more than the current number.')
+        self._rough = None
 
     def __repr__(self):
         ''' (SubtractSquareState) -> str
@@ -66,6 +110,66 @@ class SubtractSquareState(GameState):
                 self.current_total == other.current_total and
                 self.next_player == other.next_player)
 
+    def to_notation(self):
+        '''(SubtractSquareState) -> str
+
+        Return the next player and current total, as 'player:total'.
+
+        >>> SubtractSquareState('p2', current_total=17).to_notation()
+        'p2:17'
+        '''
+        return '{}:{}'.format(self.next_player, self.current_total)
+
+    @classmethod
+    def from_notation(cls, text):
+        '''(SubtractSquareState.__class__, str) -> SubtractSquareState
+
+        Return the state written as text by to_notation.
+
+        >>> SubtractSquareState.from_notation('p2:17')
+        SubtractSquareState('p2', 17)
+        '''
+        p, total = text.split(':')
+        return cls(p, current_total=int(total))
+
+    def to_bytes(self):
+        '''(SubtractSquareState) -> bytes
+
+        Return the next player, as 1 or 2, then current_total in as few
+        little-endian bytes as it fits in.
+
+        >>> SubtractSquareState('p2', current_total=300).to_bytes()
+        b'\\x02,\\x01'
+        '''
+        size = max((self.current_total.bit_length() + 7) // 8, 1)
+        return (bytes([int(self.next_player[1])]) +
+                self.current_total.to_bytes(size, 'little'))
+
+    @classmethod
+    def from_bytes(cls, data):
+        '''(SubtractSquareState.__class__, bytes) -> SubtractSquareState
+
+        Return the state written as data by to_bytes.
+
+        >>> SubtractSquareState.from_bytes(b'\\x02,\\x01')
+        SubtractSquareState('p2', 300)
+        '''
+        return cls('p{}'.format(data[0]),
+                   current_total=int.from_bytes(data[1:], 'little'))
+
+    def __reduce__(self):
+        '''(SubtractSquareState) -> tuple
+
+        Pickle self as its next player and current total only.
+
+        >>> import pickle
+        >>> s = SubtractSquareState('p2', current_total=17)
+        >>> pickle.loads(pickle.dumps(s))
+        SubtractSquareState('p2', 17)
+        '''
+        return (SubtractSquareState, (self.next_player, False,
+                                      self.current_total))
+
     def apply_move(self, move):
         ''' (SubtractSquareState, SubtractSquareMove) -> SubtractSquareState
 
@@ -76,32 +180,62 @@ class SubtractSquareState(GameState):
         >>> print(s2)
         Current total: 8; next player: p2
         '''
-        if move in self.possible_next_moves():
-            new_total = self.current_total - move.amount
-            return SubtractSquareState(self.opponent(),
-                                       current_total=new_total)
-        else:
-            return None
+        # Legal if move removes a square no larger than current_total.
+        if (isinstance(move, SubtractSquareMove) and
+                0 < move.amount <= self.current_total):
+            extend_squares(move.amount)
+            if SQUARES[bisect_right(SQUARES, move.amount) - 1] == move.amount:
+                new_total = self.current_total - move.amount
+                return SubtractSquareState(self.opponent(),
+                                           current_total=new_total)
+        return None
 
     def rough_outcome(self):
         '''(SubtractSquareState) -> float
 
         Return an estimate in interval [LOSE, WIN] of best outcome next_player
-        can guarantee from state self.
+        can guarantee from state self: WIN if current_total is a square,
+        LOSE if every move leaves a square for the opponent, DRAW otherwise.
+        If SubtractSquareState.outcome_table covers current_total, return
+        the exact outcome instead.
+
+        Takes O(sqrt(current_total)) steps at worst, and usually one, the
+        first time it is asked for.
 
         >>> SubtractSquareState('p1', current_total=5).rough_outcome()
         -1.0
         >>> SubtractSquareState('p1', current_total=16).rough_outcome()
         1.0
+        >>> SubtractSquareState('p1', current_total=8).rough_outcome()
+        0.0
+        >>> SubtractSquareState.outcome_table = OutcomeTable(10)
+        >>> SubtractSquareState('p1', current_total=8).rough_outcome()
+        1.0
+        >>> SubtractSquareState.outcome_table = None
+        '''
+        if self._rough is None:
+            self._rough = self._rough_outcome()
+        return self._rough
+
+    def _rough_outcome(self):
+        '''(SubtractSquareState) -> float
+
+        Work out rough_outcome.
         '''
-        if all([is_square(self.current_total - n**2)
-                for n in range(1, self.current_total + 1)
-                if n**2 < self.current_total]):
-            return SubtractSquareState.LOSE
-        elif is_square(self.current_total):
+        total = self.current_total
+        table = SubtractSquareState.outcome_table
+        if table is not None and total <= table.limit:
+            if table.loses(total):
+                return SubtractSquareState.LOSE
             return SubtractSquareState.WIN
-        else:
-            return SubtractSquareState.DRAW
+        if total > 0 and is_square(total):
+            return SubtractSquareState.WIN
+        i = 1
+        while i * i < total:
+            if not is_square(total - i * i):
+                return SubtractSquareState.DRAW
+            i += 1
+        return SubtractSquareState.LOSE
 
     def get_move(self):
         '''(SubtractSquareState) -> SubtractSquareMove
@@ -110,6 +244,27 @@ class SubtractSquareState(GameState):
         '''
         return SubtractSquareMove(int(input('Remove how much? ')))
 
+    def parse_move(self, text):
+        '''(SubtractSquareState, str) -> SubtractSquareMove
+
+        Return the move removing the amount written in text.
+
+        >>> SubtractSquareState('p1', current_total=17).parse_move('9')
+        SubtractSquareMove(9)
+        '''
+        return SubtractSquareMove(int(text))
+
+    def format_move(self, move):
+        '''(SubtractSquareState, SubtractSquareMove) -> str
+
+        Return the amount removed by move as text.
+
+        >>> s = SubtractSquareState('p1', current_total=17)
+        >>> s.format_move(SubtractSquareMove(16))
+        '16'
+        '''
+        return str(move.amount)
+
     def winner(self, player):
         ''' (SubtractSquareState, str) -> bool
 
@@ -135,12 +290,94 @@ class SubtractSquareState(GameState):
 
         >>> s1 = SubtractSquareState('p1', current_total=17)
         >>> s1.possible_next_moves()
-        [SubtractSquareMove(1), SubtractSquareMove(4), \
-SubtractSquareMove(9), SubtractSquareMove(16)]
+        [SubtractSquareMove(16), SubtractSquareMove(9), \
+SubtractSquareMove(4), SubtractSquareMove(1)]
+        '''
+        extend_squares(self.current_total)
+        # The largest square no larger than current_total is SQUARES[i].
+        i = bisect_right(SQUARES, self.current_total) - 1
+        return MOVES[i:0:-1]
+
+    def tactical_moves(self):
+        '''(SubtractSquareState) -> list of SubtractSquareMove
+
+        Return the move taking the whole of current_total, if it is a
+        square, or else the moves that do not leave a square for the
+        opponent to take, if there are any, or else every legal move.
+
+        >>> SubtractSquareState('p1', current_total=16).tactical_moves()
+        [SubtractSquareMove(16)]
+        >>> SubtractSquareState('p1', current_total=26).tactical_moves()
+        [SubtractSquareMove(16), SubtractSquareMove(9), SubtractSquareMove(4)]
+        >>> SubtractSquareState('p1', current_total=2).tactical_moves()
+        [SubtractSquareMove(1)]
+        '''
+        moves = self.possible_next_moves()
+        if moves and moves[0].amount == self.current_total:
+            return moves[:1]
+        safe = [move for move in moves
+                if not is_square(self.current_total - move.amount)]
+        return safe or moves
+
+    def search_size(self, depth=None):
+        '''(SubtractSquareState, int) -> float
+
+        Return a rough estimate of the number of positions in the game
+        tree below self, depth moves deep, or to the end of the game if
+        depth is None.  A total t has isqrt(t) moves, and the average
+        move takes a third of it.
+
+        >>> SubtractSquareState('p1', current_total=100).search_size(2)
+        80.0
+        '''
+        size, total, ply = 1.0, self.current_total, 0
+        while total > 0 and (depth is None or ply < depth):
+            size *= isqrt(total)
+            total = total * 2 // 3
+            ply += 1
+        return size
+
+    def moves_left(self):
+        '''(SubtractSquareState) -> int
+
+        Return a rough estimate of the number of moves left in the game,
+        taking the average move to remove a third of the total.
+
+        >>> SubtractSquareState('p1', current_total=100).moves_left()
+        11
+        '''
+        moves, total = 0, self.current_total
+        while total > 0:
+            total = total * 2 // 3
+            moves += 1
+        return moves
+
+    def positions_left(self):
+        '''(SubtractSquareState) -> float
+
+        Return the number of totals from current_total down to 0.
+
+        >>> SubtractSquareState('p1', current_total=100).positions_left()
+        101.0
+        '''
+        return float(self.current_total + 1)
+
+    def outcome_known(self):
+        '''(SubtractSquareState) -> bool
+
+        Return whether the game is over or SubtractSquareState.outcome_table
+        covers current_total, so that rough_outcome is exact.
+
+        >>> SubtractSquareState('p1', current_total=8).outcome_known()
+        False
+        >>> SubtractSquareState.outcome_table = OutcomeTable(10)
+        >>> SubtractSquareState('p1', current_total=8).outcome_known()
+        True
+        >>> SubtractSquareState.outcome_table = None
         '''
-        return [SubtractSquareMove(i**2)
-                for i in range(self.current_total, 0, -1)
-                if i*i <= self.current_total]
+        table = SubtractSquareState.outcome_table
+        return (self.current_total == 0 or
+                (table is not None and self.current_total <= table.limit))
 
 
 def is_square(n):
@@ -152,9 +389,63 @@ def is_square(n):
     False
     >>> is_square(9)
     True
+    >>> is_square((2 ** 60 + 1) ** 2 - 1)
+    False
+    '''
+    return n >= 0 and isqrt(n) ** 2 == n
+
+
+class OutcomeTable:
+    ''' Which totals, up to a limit, the next player loses.
+
+    One bit per total: bit t is set when t is a P-position, that is when
+    whoever is about to move from total t loses against best play.
+
+    limit: int         --- largest total covered
+    bits: bytearray    --- bit t % 8 of byte t // 8 is set for lost totals
     '''
-    from math import sqrt
-    return round(sqrt(n))**2 == n
+
+    def __init__(self, limit):
+        '''(OutcomeTable, int) -> NoneType
+
+        Work out the outcome of every total up to limit.  A total is lost
+        when no square leads from it to a lost total, so each lost total t
+        makes t + 1, t + 4, t + 9, ... won.
+
+        >>> table = OutcomeTable(20)
+        >>> [t for t in range(21) if table.loses(t)]
+        [0, 2, 5, 7, 10, 12, 15, 17, 20]
+        '''
+        self.limit = limit
+        self.bits = bytearray(limit // 8 + 1)
+        extend_squares(limit)
+        won = bytearray(limit + 1)
+        for t in range(limit + 1):
+            if not won[t]:
+                self.bits[t >> 3] |= 1 << (t & 7)
+                for square in SQUARES[1:]:
+                    if t + square > limit:
+                        break
+                    won[t + square] = 1
+
+    def __repr__(self):
+        '''(OutcomeTable) -> str
+
+        Return a string representation of self.
+
+        >>> OutcomeTable(20)
+        OutcomeTable(20)
+        '''
+        return 'OutcomeTable({})'.format(self.limit)
+
+    def loses(self, total):
+        '''(OutcomeTable, int) -> bool
+
+        Return whether the next player loses from total.
+
+        Assume: 0 <= total <= self.limit
+        '''
+        return bool(self.bits[total >> 3] >> (total & 7) & 1)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,168 @@
+import threading
+import time
+from search_control import SearchCancelled, SearchControl, fallback_move
+
+
+class TimeManager:
+    """ Shares out one player's game clock between that player's moves.
+
+    Each move gets a soft budget, after which no deeper search is begun,
+    and a hard budget, after which the search under way is cancelled and
+    the best move found so far is played.  The soft budget is the time on
+    the clock shared over the player's moves expected to go, from the
+    moves_left of the state, plus most of the increment.  A position
+    whose best move changes from one depth to the next is critical, and
+    its soft budget grows by EXTEND each time, up to the hard budget.
+
+    clock: float -- seconds left on the clock
+    increment: float -- seconds added to the clock after each move
+    """
+
+    # Share of the increment counted on in the soft budget.
+    INCREMENT_SHARE = 0.75
+    # The hard budget is this many soft budgets, but at most HARD_SHARE
+    # of the clock.
+    HARD = 3.0
+    HARD_SHARE = 0.5
+    # Growth of the soft budget when the best move changes.
+    EXTEND = 1.5
+
+    def __init__(self, clock, increment=0.0):
+        """(TimeManager, float, float) -> NoneType
+
+        Initialize self to manage a clock of clock seconds, gaining
+        increment seconds after each move.
+
+        >>> TimeManager(60.0)
+        TimeManager(60.0, 0.0)
+        """
+
+        self.clock = clock
+        self.increment = increment
+
+    def __repr__(self):
+        """(TimeManager) -> str
+
+        Return a string representation of self.
+        """
+
+        return 'TimeManager({}, {})'.format(repr(self.clock),
+                                            repr(self.increment))
+
+    @property
+    def flagged(self):
+        """(TimeManager) -> bool
+
+        Return whether the clock has run out.
+
+        >>> manager = TimeManager(1.0)
+        >>> manager.spend(1.5)
+        >>> manager.flagged
+        True
+        """
+
+        return self.clock < 0
+
+    def spend(self, seconds):
+        """(TimeManager, float) -> NoneType
+
+        Take seconds used by a move off the clock, and add the increment.
+
+        >>> manager = TimeManager(10.0, 2.0)
+        >>> manager.spend(3.0)
+        >>> manager.clock
+        9.0
+        """
+
+        self.clock -= seconds
+        if self.clock >= 0:
+            self.clock += self.increment
+
+    def budget(self, state):
+        """(TimeManager, GameState) -> (float, float)
+
+        Return the soft and hard budgets, in seconds, for a move from
+        state.
+
+        >>> from tippy_game_state import TippyGameState
+        >>> TimeManager(60.0).budget(TippyGameState('p1', n=4))
+        (7.5, 22.5)
+        """
+
+        to_go = max((state.moves_left() + 1) // 2, 1)
+        soft = (self.clock / to_go +
+                self.increment * TimeManager.INCREMENT_SHARE)
+        hard = min(soft * TimeManager.HARD,
+                   max(self.clock, 0) * TimeManager.HARD_SHARE)
+        return (min(soft, hard), hard)
+
+    def suggest_move(self, strategy, state):
+        """(TimeManager, Strategy, GameState) -> Move
+
+        Return a move for state from strategy.iter_suggestions, within
+        the budgets for state, and take the time used off the clock.  A
+        further depth is begun only when it is expected, from the growth
+        of the depths so far, to end within the soft budget.  If the
+        hard budget runs out, the best move the search had found is
+        played, or the fallback_move of state if it had found none.
+
+        >>> from subtract_square_state import SubtractSquareState
+        >>> from strategy_minimax_myopic import StrategyMinimaxMyopic
+        >>> manager = TimeManager(60.0)
+        >>> state = SubtractSquareState('p1', current_total=27)
+        >>> manager.suggest_move(StrategyMinimaxMyopic(20), state)
+        SubtractSquareMove(25)
+        >>> manager.clock < 60.0
+        True
+
+        A search cut off by the hard budget still gives the best move it
+        found, here 1 rather than the fallback_move, 4.
+
+        >>> import time
+        >>> class Unending:
+        ...     def iter_suggestions(self, state, control):
+        ...         control.best = [1.0, SubtractSquareMove(1)]
+        ...         while True:
+        ...             time.sleep(0.001)
+        ...             control.checkpoint(0)
+        >>> from subtract_square_move import SubtractSquareMove
+        >>> state = SubtractSquareState('p1', current_total=10)
+        >>> TimeManager(0.01).suggest_move(Unending(), state)
+        SubtractSquareMove(1)
+        """
+
+        start = time.time()
+        soft, hard = self.budget(state)
+        control = SearchControl()
+        timer = threading.Timer(hard, control.cancel)
+        timer.daemon = True
+        timer.start()
+        move = None
+        last, previous = start, 0.0
+        try:
+            for depth, found, score, stats in strategy.iter_suggestions(
+                    state, control):
+                if move is not None and found != move:
+                    soft = min(soft * TimeManager.EXTEND, hard)
+                move = found
+                now = time.time()
+                took = now - last
+                growth = took / previous if previous > 0 else 1.0
+                if now - start + took * growth > soft:
+                    break
+                last, previous = now, took
+        except SearchCancelled:
+            pass
+        finally:
+            timer.cancel()
+        if control.best is not None:
+            move = control.best[1]
+        elif move is None:
+            move = fallback_move(state)
+        self.spend(time.time() - start)
+        return move
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,21 +1,63 @@
 from game_state import GameState
 from tippy_move import TippyMove
-from copy import deepcopy
-import time
+from tippy_geometry import TippyGeometry
+from move_log import MoveLog
 
 
 class TippyGameState(GameState):
-    """ The state of the Tippy game. """
+    """ The state of the Tippy game.
+
+    geometry: TippyGeometry -- the tippies of the board, shared by every
+                               state of the same size, or None if they
+                               are not known
+    history: MoveLog -- the moves played so far, shared with the states
+                        they were played from
+    """
+
+    # Weight given by rough_outcome to a tippy the opponent has not
+    # blocked, by the number of pieces in it.
+    TIPPY_WEIGHTS = (0, 1, 3, 9)
+
+    instructions = """
+        Tippy is a variation of tic-tac-toe. Players take turns
+        placing either an X or an O on an n x n grid (where n is
+        at least 3), with the goal of forming a tippy. In this
+        example below, in a 3x3 grid, X has won by forming a tippy:
+        
+                  0   1   2 
+                -------------
+            0	| X | X | O |
+                -------------
+            1	| O | X | X |
+                -------------
+            2	| O |   |   |
+                -------------
+
+        """
+
+    # The InternTable apply_move looks new states up in, so that each
+    # position is built only once, or None to build every state reached.
+    intern_table = None
+
+    # Attributes starting with _ are worked out the first time they are
+    # needed: the tippy counts (_counts, _live, _open, passed on by
+    # apply_move), the legal moves (_moves), rough_outcome (_rough) and
+    # position_key (_key).
+    __slots__ = ('n', 'board', 'geometry', 'history', '_counts', '_live',
+                 '_open', '_moves', '_rough', '_key', '__weakref__')
 
     def __init__(self, p, n=3, board=[], player_to_move={'p1': [], 'p2': []},
                  all_tippies=None, interactive=False):
         """(TippyGameState, str, int, list of list of object, dict of {str:
-            list of Tippy Moves}, list of list of TippyMove, bool) -> NoneType
+            list of Tippy Moves} or MoveLog, TippyGeometry or list of list of
+            TippyMove, bool) -> NoneType
 
         Initialize self to have a next_player p, a board of size n, a board, a
         player_to_move which stores all the moves of the players,
-        the list of all possible tippy moves all_tippies and the instructions
-        of the game. 
+        and the list of all possible tippy moves all_tippies.  all_tippies
+        may be given as the TippyGeometry of the board, as any list of
+        tippies stands for that geometry, and player_to_move as the
+        MoveLog of the moves played.
 
         >>> tippygame = TippyGameState('p1')
         >>> tippygame.next_player
@@ -26,6 +68,8 @@ class TippyGameState(GameState):
         [[None, None, None], [None, None, None], [None, None, None]]
         >>> tippygame.player_to_move == {'p1': [], 'p2': []}
         True
+        >>> tippygame.geometry
+        TippyGeometry(3)
         """
  
         GameState.__init__(self, p, interactive=False)
@@ -38,25 +82,8 @@ class TippyGameState(GameState):
             n = int(n)
             
         self.n = n
-          
-        self.instructions = """
-        Tippy is a variation of tic-tac-toe. Players take turns
-        placing either an X or an O on an n x n grid (where n is
-        at least 3), with the goal of forming a tippy. In this
-        example below, in a 3x3 grid, X has won by forming a tippy:
-        
-                  0   1   2 
-                -------------
-            0	| X | X | O |
-                -------------
-            1	| O | X | X |
-                -------------
-            2	| O |   |   |
-                -------------
-
-        """
         
-        self.board = deepcopy(board)
+        self.board = [row[:] for row in board]
 
         # If the board is empty (the game just started), then
         # create a new board and generate all the possible tippies
@@ -64,16 +91,12 @@ class TippyGameState(GameState):
         
         if self.board == []:
             self.create_new_board()
-            all_tippies = self.find_tippies()
+            all_tippies = TippyGeometry(self.n)
 
         self.all_tippies = all_tippies
         
         self.player_to_move = player_to_move
         
-        if self.all_tippies is not None:
-            if not self.possible_next_moves():
-                self.over = True
-        
     def __repr__(self):
         """(TippyGameState) -> str
 
@@ -94,7 +117,86 @@ class TippyGameState(GameState):
                       repr(self.n),
                       repr(self.board),
                       repr(self.player_to_move),
-                      repr(self.all_tippies))
+                      repr(self.geometry))
+
+    @property
+    def player_to_move(self):
+        """(TippyGameState) -> dict of {str: list of TippyMove}
+
+        Return the moves played so far by each player, in order.
+
+        >>> tippygame = TippyGameState('p1').apply_move(TippyMove([1, 1]))
+        >>> tippygame.player_to_move == {'p1': [TippyMove([1, 1])], 'p2': []}
+        True
+        """
+
+        return {'p1': self.history.moves('p1'),
+                'p2': self.history.moves('p2')}
+
+    @player_to_move.setter
+    def player_to_move(self, moves):
+        """(TippyGameState, dict of {str: list of TippyMove} or MoveLog)
+                                                               -> NoneType
+
+        Record moves as the moves played so far, forgetting what was
+        worked out from the moves before.  A dict of moves by player is
+        taken as played in turn, starting with p1.
+
+        >>> tippygame = TippyGameState('p1')
+        >>> tippygame.player_to_move = {'p1': [TippyMove([1, 1])], 'p2': []}
+        >>> tippygame.history
+        MoveLog([('p1', TippyMove([1, 1]))])
+        """
+
+        if not isinstance(moves, MoveLog):
+            moves = MoveLog.from_players(moves)
+        self.history = moves
+        self.forget()
+
+    @property
+    def all_tippies(self):
+        """(TippyGameState) -> tuple of tuple of TippyMove
+
+        Return the tippies of the board, or None if they are not known.
+
+        >>> len(TippyGameState('p1', n=4).all_tippies)
+        24
+        """
+
+        if self.geometry is None:
+            return None
+        return self.geometry.tippies
+
+    @all_tippies.setter
+    def all_tippies(self, tippies):
+        """(TippyGameState, TippyGeometry or list of list of TippyMove)
+                                                              -> NoneType
+
+        Make self use the geometry of its board size, or none if tippies
+        is None.  Tippy counts worked out before are forgotten.
+
+        >>> tippygame = TippyGameState('p1')
+        >>> tippygame.all_tippies = None
+        >>> tippygame.geometry is None
+        True
+        >>> tippygame.all_tippies = tippygame.find_tippies()
+        >>> tippygame.geometry is TippyGeometry(3)
+        True
+        """
+
+        self.geometry = None if tippies is None else TippyGeometry(self.n)
+        self.forget()
+
+    def forget(self):
+        """(TippyGameState) -> NoneType
+
+        Forget everything worked out from the board and moves of self, to
+        be worked out again when next needed.  Needed only after changing
+        board directly.
+        """
+
+        self._counts = self._live = self._open = None
+        self._moves = self._rough = self._key = None
 
     def __str__(self):
         r"""(TippyGameState) -> str
@@ -134,7 +236,8 @@ class TippyGameState(GameState):
     def __eq__(self, other):
         """(TippyGameState, object) -> bool
 
-        Return whether self is equivalent to other.
+        Return whether self is equivalent to other: the same player is to
+        move on the same board, whatever order the pieces were placed in.
 
         >>> tippygame = TippyGameState('p1')
         >>> other1 = TippyGameState('p2')
@@ -143,14 +246,34 @@ class TippyGameState(GameState):
         >>> other2 = TippyGameState('p1')
         >>> tippygame == other2
         True
+        >>> moves = [TippyMove([0, 0]), TippyMove([1, 1]), TippyMove([2, 2])]
+        >>> state1, state2 = tippygame, tippygame
+        >>> for move in moves:
+        ...     state1 = state1.apply_move(move)
+        >>> for move in moves[::-1]:
+        ...     state2 = state2.apply_move(move)
+        >>> state1 == state2
+        True
         """
         
+        if self is other:
+            return True
         return (isinstance(other, TippyGameState) and
                 self.next_player == other.next_player and
-                self.n == other.n and
-                self.board == other.board and
-                self.player_to_move == other.player_to_move and
-                self.all_tippies == other.all_tippies)
+                self.geometry is other.geometry and
+                self.board == other.board)
+
+    def __hash__(self):
+        """(TippyGameState) -> int
+
+        Return a hash of self, the same for equivalent states.
+
+        >>> hash(TippyGameState('p1')) == hash(TippyGameState('p1'))
+        True
+        """
+
+        return hash((self.next_player, self.n,
+                     tuple(tuple(row) for row in self.board)))
     
     def create_new_board(self): 
         """(TippyGameState) -> Nonetype
@@ -162,7 +285,7 @@ class TippyGameState(GameState):
             coord_list = []
             for x in range(self.n):
                 coord_list.append(None)
-            self.board.append(deepcopy(coord_list))
+            self.board.append(coord_list)
             
     def get_move(self):
         """(TippyGameState) -> TippyMove
@@ -177,7 +300,160 @@ class TippyGameState(GameState):
         y = input('Pick the y coordinate of a move: ')
 
         return TippyMove([int(x), int(y)])
-    
+
+    def parse_move(self, text):
+        """(TippyGameState, str) -> TippyMove
+
+        Return the move at the coordinates written in text as 'x,y'.
+
+        >>> TippyGameState('p1').parse_move('2,1')
+        TippyMove([2, 1])
+        """
+
+        x, y = text.split(',')
+        return TippyMove([int(x), int(y)])
+
+    def format_move(self, move):
+        """(TippyGameState, TippyMove) -> str
+
+        Return the coordinates of move as 'x,y'.
+
+        >>> TippyGameState('p1').format_move(TippyMove([2, 1]))
+        '2,1'
+        """
+
+        return '{},{}'.format(move.move[0], move.move[1])
+
+    def to_notation(self):
+        """(TippyGameState) -> str
+
+        Return the next player and the board, as 'player:' followed by
+        the rows from top to bottom separated by '/', where x is a piece
+        of p1, o a piece of p2 and . an empty square.
+
+        >>> tippygame = TippyGameState('p1')
+        >>> tippygame.apply_move(TippyMove([1, 0])).to_notation()
+        'p2:.x./.../...'
+        """
+
+        pieces = {None: '.', 'p1': 'x', 'p2': 'o'}
+        return '{}:{}'.format(self.next_player, '/'.join(
+            ''.join(pieces[square] for square in row) for row in self.board))
+
+    @classmethod
+    def from_notation(cls, text):
+        """(TippyGameState.__class__, str) -> TippyGameState
+
+        Return the state written as text by to_notation.  Moves played
+        are recorded in order from left to right, top to bottom.
+
+        >>> tippygame = TippyGameState.from_notation('p2:.x./.../...')
+        >>> tippygame == TippyGameState('p1').apply_move(TippyMove([1, 0]))
+        True
+        """
+
+        p, rows = text.split(':')
+        rows = rows.split('/')
+        players = {'.': None, 'x': 'p1', 'o': 'p2'}
+        return cls.from_board(p, [[players[square] for square in row]
+                                  for row in rows])
+
+    @classmethod
+    def from_board(cls, p, board):
+        """(TippyGameState.__class__, str, list of list of object)
+                                                         -> TippyGameState
+
+        Return the state with next player p and pieces on board.  Moves
+        played are recorded in order from left to right, top to bottom.
+
+        >>> tippygame = TippyGameState.from_board('p1', [['p1', 'p2'], \
+[None, None]])
+        >>> tippygame.player_to_move == {'p1': [TippyMove([0, 0])], \
+'p2': [TippyMove([1, 0])]}
+        True
+        """
+
+        player_to_move = {'p1': [], 'p2': []}
+        for y in range(len(board)):
+            for x in range(len(board)):
+                if board[y][x] is not None:
+                    player_to_move[board[y][x]].append(TippyMove([x, y]))
+        return cls(p, len(board), board, player_to_move,
+                   TippyGeometry(len(board)))
+
+    def to_bytes(self):
+        """(TippyGameState) -> bytes
+
+        Return the board size, the next player, then the squares of p1
+        and of p2 as masks of (n * n + 7) // 8 little-endian bytes each.
+
+        >>> tippygame = TippyGameState('p1').apply_move(TippyMove([1, 0]))
+        >>> tippygame.to_bytes()
+        b'\\x03\\x02\\x02\\x00\\x00\\x00'
+        """
+
+        n, player, p1, p2 = self.position_key()
+        size = (n * n + 7) // 8
+        return (bytes([n, int(player[1])]) + p1.to_bytes(size, 'little') +
+                p2.to_bytes(size, 'little'))
+
+    def position_key(self):
+        """(TippyGameState) -> (int, str, int, int)
+
+        Return the board size, the next player and the squares of p1 and
+        of p2 as masks, the same for equivalent states.
+
+        >>> tippygame = TippyGameState('p1').apply_move(TippyMove([1, 0]))
+        >>> tippygame.position_key()
+        (3, 'p2', 2, 0)
+        """
+
+        if self._key is None:
+            masks = {'p1': 0, 'p2': 0}
+            for y in range(self.n):
+                for x in range(self.n):
+                    if self.board[y][x] is not None:
+                        masks[self.board[y][x]] |= 1 << (y * self.n + x)
+            self._key = (self.n, self.next_player, masks['p1'], masks['p2'])
+        return self._key
+
+    @classmethod
+    def from_bytes(cls, data):
+        """(TippyGameState.__class__, bytes) -> TippyGameState
+
+        Return the state written as data by to_bytes.  Moves played are
+        recorded in order from left to right, top to bottom.
+
+        >>> tippygame = TippyGameState('p1').apply_move(TippyMove([1, 0]))
+        >>> TippyGameState.from_bytes(tippygame.to_bytes()) == tippygame
+        True
+        """
+
+        n, size = data[0], (data[0] * data[0] + 7) // 8
+        p1 = int.from_bytes(data[2:2 + size], 'little')
+        p2 = int.from_bytes(data[2 + size:2 + 2 * size], 'little')
+        board = []
+        for y in range(n):
+            board.append([])
+            for x in range(n):
+                bit = 1 << (y * n + x)
+                board[y].append('p1' if p1 & bit else
+                                'p2' if p2 & bit else None)
+        return cls.from_board('p{}'.format(data[1]), board)
+
+    def __reduce__(self):
+        """(TippyGameState) -> tuple
+
+        Pickle self as the bytes of to_bytes only.
+
+        >>> import pickle
+        >>> tippygame = TippyGameState('p1').apply_move(TippyMove([1, 1]))
+        >>> pickle.loads(pickle.dumps(tippygame)) == tippygame
+        True
+        """
+
+        return (TippyGameState.from_bytes, (self.to_bytes(),))
+
     def apply_move(self, tp_move):
         """(TippyGameState, TippyMove) -> TippyGameState
 
@@ -192,33 +468,165 @@ class TippyGameState(GameState):
         'p1': [TippyMove([1, 1])]}
         >>> tippy1 == tippy2
         True
+
+        A state built from a board, with its tippies left unknown, still
+        takes moves.
+
+        >>> tippy3 = TippyGameState('p1', 3, [['p2', None, None],\
+        ['p2', 'p1', None], [None, 'p1', None]], {'p2': [TippyMove([0, 0]),\
+        TippyMove([0, 1])], 'p1': [TippyMove([1, 2]), TippyMove([1, 1])]})
+        >>> tippy3.apply_move(TippyMove([2, 1])).board[1]
+        ['p2', 'p1', 'p1']
+
+        With an intern_table, a position reached again by other moves is
+        the state already built for it.
+
+        >>> from intern_table import InternTable
+        >>> TippyGameState.intern_table = InternTable()
+        >>> moves = [TippyMove([0, 0]), TippyMove([1, 1]), TippyMove([2, 2])]
+        >>> state1 = state2 = TippyGameState('p1')
+        >>> for move in moves:
+        ...     state1 = state1.apply_move(move)
+        >>> for move in moves[::-1]:
+        ...     state2 = state2.apply_move(move)
+        >>> state1 is state2
+        True
+        >>> TippyGameState.intern_table = None
         """
 
-        if tp_move in self.possible_next_moves():
+        # Legal if the square is on the board and empty, and nobody has
+        # won yet.
+        if (isinstance(tp_move, TippyMove) and
+                0 <= tp_move.move[0] < self.n and
+                0 <= tp_move.move[1] < self.n and
+                self.board[tp_move.move[1]][tp_move.move[0]] is None and
+                not (self.winner('p1') or self.winner('p2'))):
             
-            board_copy = deepcopy(self.board)
-            # Adds players move onto board as player's name (ie 'p1' or 'p2')
-            board_copy[tp_move.move[1]][tp_move.move[0]] = self.next_player  
-            
-            player_to_move_copy = deepcopy(self.player_to_move)
-            # Keep track of move played
-            player_to_move_copy[self.next_player].append(tp_move)
+            # The key of the new position follows from that of self.
+            table = TippyGameState.intern_table
+            if table is not None:
+                n, player, p1, p2 = self.position_key()
+                bit = 1 << (tp_move.move[1] * n + tp_move.move[0])
+                if player == 'p1':
+                    key = (n, 'p2', p1 | bit, p2)
+                else:
+                    key = (n, 'p1', p1, p2 | bit)
+                new_state = table.lookup(key)
+                if new_state is not None:
+                    return new_state
+
+            # Keep track of move played, sharing the moves before it.
+            history = self.history.append(self.next_player, tp_move)
             
             # Pass all pertinent information onto new state
             # This includes board size, board data, moves played 
-            # Also switches next_player to opponent
+            # Also switches next_player to opponent; the new state
+            # copies the board.
             
-            return TippyGameState(self.opponent(), n=self.n,
-                                  board=board_copy, 
-                                  player_to_move=player_to_move_copy,
-                                  all_tippies=self.all_tippies)
+            new_state = TippyGameState(self.opponent(), n=self.n,
+                                       board=self.board,
+                                       player_to_move=history,
+                                       all_tippies=self.geometry)
+            # Adds players move onto board as player's name (ie 'p1' or 'p2')
+            new_state.board[tp_move.move[1]][tp_move.move[0]] = \
+                self.next_player
+            self.count_move(new_state, tp_move)
+            if table is not None:
+                new_state._key = key
+                table.add(key, new_state)
+            return new_state
         else:
-            return None            
-            
+            return None
+
+    def live_tippies(self):
+        """(TippyGameState) -> dict of {str: list of int}
+
+        Return, for each player, how many of the tippies the opponent has
+        no piece in hold 0, 1, 2, 3 and 4 pieces of the player.
+
+        >>> tippygame = TippyGameState('p1').apply_move(TippyMove([1, 1]))
+        >>> tippygame.live_tippies() == {'p1': [0, 8, 0, 0, 0],\
+        'p2': [0, 0, 0, 0, 0]}
+        True
+        >>> tippygame = tippygame.apply_move(TippyMove([0, 0]))
+        >>> tippygame.live_tippies() == {'p1': [0, 6, 0, 0, 0],\
+        'p2': [0, 0, 0, 0, 0]}
+        True
+        """
+
+        if self._live is None:
+            self.count_tippies()
+        return self._live
+
+    def count_tippies(self):
+        """(TippyGameState) -> NoneType
+
+        Work out, from scratch, the pieces of each player in each tippy,
+        the live tippy counts returned by live_tippies and the number of
+        tippies through each square still open to either player.
+        """
+
+        geometry = self.geometry or TippyGeometry(self.n)
+        cells = geometry.square_tippies if self.geometry else {}
+        tippies = len(geometry.tippies) if self.geometry else 0
+        self._counts = {'p1': [0] * tippies, 'p2': [0] * tippies}
+        for player, move in self.history:
+            for i in cells.get(tuple(move.move), ()):
+                self._counts[player][i] += 1
+        self._live = {}
+        for player, other in (('p1', 'p2'), ('p2', 'p1')):
+            self._live[player] = [0] * 5
+            for i in range(tippies):
+                if self._counts[other][i] == 0:
+                    self._live[player][self._counts[player][i]] += 1
+        p1, p2 = self._counts['p1'], self._counts['p2']
+        self._open = {}
+        for square in geometry.square_tippies:
+            self._open[square] = len([i for i in cells.get(square, ())
+                                      if not (p1[i] and p2[i])])
+
+    def count_move(self, new_state, tp_move):
+        """(TippyGameState, TippyGameState, TippyMove) -> NoneType
+
+        Give new_state, reached by playing tp_move from self, its tippy
+        counts, updating those of self for the tippies through tp_move
+        only.  Nothing is counted if the tippies of self are not known.
+        """
+
+        if self.geometry is None:
+            # No tippies are known to count; new_state counts none either
+            # when asked.
+            return
+        if self._live is None:
+            self.count_tippies()
+        player, other = self.next_player, self.opponent()
+        counts = {'p1': self._counts['p1'][:], 'p2': self._counts['p2'][:]}
+        live = {'p1': self._live['p1'][:], 'p2': self._live['p2'][:]}
+        open_squares = self._open
+        for i in self.geometry.square_tippies[tuple(tp_move.move)]:
+            mine, theirs = counts[player][i], counts[other][i]
+            if theirs == 0:
+                # Still live for player, with one more piece.
+                live[player][mine] -= 1
+                live[player][mine + 1] += 1
+            if mine == 0:
+                # Now blocked for the opponent.
+                live[other][theirs] -= 1
+                if theirs:
+                    # Now closed to both players.
+                    if open_squares is self._open:
+                        open_squares = dict(self._open)
+                    for square in self.geometry.tippy_squares[i]:
+                        open_squares[square] -= 1
+            counts[player][i] = mine + 1
+        new_state._counts, new_state._live = counts, live
+        new_state._open = open_squares
+
     def winner(self, player):
         """(TippyGameState, str) -> bool
 
-        Return True iff the game is over and player has won. 
+        Return True iff the game is over and player has won.  No one has
+        won if the tippies of self are not known.
 
         >>> tippygame1 = TippyGameState('p1')
         >>> tippygame1.winner('p1')
@@ -233,30 +641,26 @@ class TippyGameState(GameState):
         True
         >>> tippygame2.winner('p2')
         False
+
+        Positions not reached by playing in turn count too.
+
+        >>> TippyGameState.from_notation('p2:xx./.xx/...').winner('p1')
+        True
         """
         
         
-        moves_played = self.player_to_move[player]
-        
-        if len(moves_played) < 4:
+        if self.geometry is None:
             return False
-        else:
-            for route in self.all_tippies:
-                lst = []
-                for move in route: 
-                    if move in moves_played:
-                        lst.append(True) 
-                    else:
-                        lst.append(False)
-                if all(lst):
-                    return True   
-        return False
+        # A tippy full of player's pieces has none of the opponent's, so
+        # it is counted by live_tippies, whose counts come from the state
+        # before through count_move, updated for the square just taken.
+        return self.live_tippies()[player][4] > 0
   
     def possible_next_moves(self):
         """(TippyGameState) -> list of TippyMove
 
         Return a (possibly empty) list of moves that are legal
-        from the present state.
+        from the present state.  They are worked out once per state.
 
         >>> tippygame = TippyGameState('p1')
         >>> tippygame.possible_next_moves() == [TippyMove([0, 0]),\
@@ -266,26 +670,109 @@ class TippyGameState(GameState):
         True
         """
         
-        possible_moves = []
+        if self._moves is None:
+            self._moves = []
+            if not (self.winner('p1') or self.winner('p2')):
+                for x in range(self.n):
+                    for y in range(self.n):
+                        if self.board[x][y] is None:
+                            self._moves.append(TippyMove([y, x]))
+        return self._moves[:]
+
+    def search_moves(self):
+        """(TippyGameState) -> list of TippyMove
+
+        Return the legal moves into squares of a tippy still open to
+        either player, and one move into any other square.  Pieces on
+        those other squares can never be part of a win, so which one of
+        them is taken makes no difference.  Return [] if no tippy is open
+        to either player, as the game can only end in a draw.
+
+        >>> tippygame = TippyGameState('p1')
+        >>> for move in [[2, 1], [0, 1], [1, 2], [1, 0]]:
+        ...     tippygame = tippygame.apply_move(TippyMove(move))
+        >>> len(tippygame.possible_next_moves())
+        5
+        >>> tippygame.search_moves()
+        [TippyMove([0, 0]), TippyMove([2, 0]), TippyMove([1, 1]), \
+TippyMove([0, 2])]
+        >>> tippygame = TippyGameState('p1')
+        >>> for move in [[0, 1], [1, 1], [2, 1]]:
+        ...     tippygame = tippygame.apply_move(TippyMove(move))
+        >>> tippygame.search_moves()
+        []
+        >>> tippygame.tactical_moves()
+        [TippyMove([0, 0])]
+        """
 
-        if self.winner('p1') or self.winner('p2'):
+        moves = self.possible_next_moves()
+        live = self.live_tippies()
+        # Tippies with no piece in them are live for both players.
+        open_tippies = sum(live['p1']) + sum(live['p2']) - live['p1'][0]
+        if open_tippies == 0:
             return []
-        else:
-            for x in range(self.n):
-                for y in range(self.n):
-                    if self.board[x][y] is None:
-                        possible_moves.append(TippyMove([y, x]))
-            return possible_moves
+        if self.geometry is None or open_tippies == len(self.all_tippies):
+            return moves
+        relevant, spare = [], None
+        for move in moves:
+            if self._open[tuple(move.move)]:
+                relevant.append(move)
+            elif spare is None:
+                spare = move
+                relevant.append(move)
+        return relevant
+
+    def tactical_moves(self):
+        """(TippyGameState) -> list of TippyMove
+
+        Return the move completing a tippy of next_player, if there is
+        one, or else the moves into tippies where the opponent has three
+        pieces and next_player none, if there are any, or else every
+        move of search_moves.  Only the tippies through each empty square
+        are looked at.
+
+        >>> tippygame = TippyGameState('p1')
+        >>> for move in [[1, 1], [0, 0], [1, 2], [0, 1], [0, 2]]:
+        ...     tippygame = tippygame.apply_move(TippyMove(move))
+        >>> tippygame.tactical_moves()
+        [TippyMove([2, 1])]
+        >>> tippygame = tippygame.apply_move(TippyMove([2, 2]))
+        >>> tippygame.tactical_moves()
+        [TippyMove([2, 1])]
+        >>> len(TippyGameState('p1').tactical_moves())
+        9
+        """
+
+        moves = self.search_moves()
+        if not moves:
+            # Nobody can win any more: any move will do.
+            return self.possible_next_moves()[:1]
+        live = self.live_tippies()
+        player, other = self.next_player, self.opponent()
+        if not (live[player][3] or live[other][3]):
+            return moves
+        mine, theirs = self._counts[player], self._counts[other]
+        blocks = []
+        for move in moves:
+            for i in self.geometry.square_tippies[tuple(move.move)]:
+                if mine[i] == 3 and theirs[i] == 0:
+                    return [move]
+                if theirs[i] == 3 and mine[i] == 0 and move not in blocks:
+                    blocks.append(move)
+        return blocks or moves
 
     def rough_outcome(self):
         """(TippyGameState) -> float
 
         Return an estimate in internal [LOSE, WIN, DRAW] of best outcome
-        next_player can guarantee from state self.
+        next_player can guarantee from state self.  Takes constant time,
+        given the counts of live_tippies.
 
         >>> tippygame1 = TippyGameState('p1')
         >>> tippygame1.rough_outcome()
         0.0
+        >>> tippygame1.apply_move(TippyMove([1, 1])).rough_outcome()
+        -0.8888888888888888
         >>> tippygame2 = TippyGameState('p2', 3)
         >>> tippygame2.board = [['p1', 'p1', None], ['p2', 'p1', 'p1'], \
         ['p2', 'p2', None]] 
@@ -297,82 +784,87 @@ class TippyGameState(GameState):
         -1.0
         """
 
-        current_player_moves = self.player_to_move[self.next_player]
-        opponent_moves = self.player_to_move[self.opponent()]
-        
-        # list of possible tippy routes available to the current player:
-        current_player_routes = []
-        # list of possible tippy routes available to the opponent:
-        opponent_routes = []
-
-        # Loop over all the possible tippy routes. If at least
-        # one route is being completed by the current player and
-        # the route isn't blocked by the opponent, append the route to
-        # the current player's route list.
-        # Complete similar task for the opponent.
-
-        for route in self.all_tippies:
-            if (any([x in route for x in current_player_moves]) and 
-                    all([item not in opponent_moves for item in route])):
-                current_player_routes.append(route)
-            elif (any([x in route for x in opponent_moves]) and
-                  all([item not in current_player_moves for item in route])):
-                opponent_routes.append(route)
-
-        # Check which player has more tippy routes, and return a
-        # score accordingly. 
-
-        if len(current_player_routes) > len(opponent_routes):
-            return TippyGameState.WIN
-        elif len(opponent_routes) > len(current_player_routes):
-            return TippyGameState.LOSE
+        # Tippies the opponent has blocked no longer matter.  Of the
+        # others, those with more pieces in them weigh more, and a
+        # player with three pieces in one is a move away from a win.
+
+        if self._rough is not None:
+            return self._rough
+        live = self.live_tippies()
+        mine, theirs = live[self.next_player], live[self.opponent()]
+        if theirs[4]:
+            self._rough = TippyGameState.LOSE
+        elif mine[4] or mine[3]:
+            self._rough = TippyGameState.WIN
         else:
-            return TippyGameState.DRAW
+            score = total = 0
+            for pieces in range(1, 4):
+                weight = TippyGameState.TIPPY_WEIGHTS[pieces]
+                score += weight * (mine[pieces] - theirs[pieces])
+                total += weight * (mine[pieces] + theirs[pieces])
+            self._rough = score / (total + 1)
+        return self._rough
+
+    def search_size(self, depth=None):
+        """(TippyGameState, int) -> float
+
+        Return a rough estimate of the number of positions in the game
+        tree below self, depth moves deep, or to the end of the game if
+        depth is None.  Each move fills a square, so the moves to search
+        shrink by one with every move until the board is full.
+
+        >>> TippyGameState('p1').search_size()
+        362880.0
+        >>> TippyGameState('p1', n=4).search_size(2)
+        240.0
+        """
+
+        empty = len(self.possible_next_moves())
+        moves = len(self.search_moves())
+        if depth is not None:
+            empty = min(empty, depth)
+        size = 1.0
+        for i in range(empty):
+            size *= max(moves - i, 1)
+        return size
+
+    def moves_left(self):
+        """(TippyGameState) -> int
+
+        Return the number of empty squares, the most moves left in the
+        game, or 0 if it is over.
+
+        >>> TippyGameState('p1', n=4).moves_left()
+        16
+        """
+
+        return len(self.possible_next_moves())
+
+    def positions_left(self):
+        """(TippyGameState) -> float
+
+        Return the number of ways to fill the empty squares of self with
+        pieces of either player or none.
+
+        >>> TippyGameState('p1').positions_left()
+        19683.0
+        """
+
+        return 3.0 ** len(self.possible_next_moves())
 
     def find_tippies(self):
-            """(FindTippy) -> Nonetype
-            
-            Go through all tippy routes on every single coord in self.board. 
-            Search for all possible tippy combinations, append them to 
-            self.all_tippies. Exclude any duplicate tippies. """
+        """(TippyGameState) -> list of list of TippyMove
 
-            tippies = []
-            
+        Return every tippy on the board, each as the list of its squares
+        in sorted order, without duplicates.
 
-            for x in range(len(self.board)):
-                for y in range(len(self.board[x])):
-                    coords = [x,y]
-                    
-                    tippy_route = [[self.up, self.right, self.up],
-                                    [self.up, self.left, self.up],
-                                    [self.down, self.right, self.down],
-                                    [self.down, self.left, self.down],
-                                    [self.right, self.up, self.right],
-                                    [self.right, self.down, self.right],
-                                    [self.left, self.up, self.left],
-                                    [self.left, self.down, self.left]]
-                    
-                    all_routes = [] 
-                     
-                    for route in tippy_route:
-                        m = coords.copy()
-                        get_route = ([coords] +
-                                     [c(m).copy() for c in route]).copy()
-                        if not ([] in get_route):
-                            get_route.sort()
-                            new_route = []
-                            for i in range(len(get_route)):
-                                new_route.append(TippyMove(get_route[i]))
-                            all_routes += [new_route]
-                            
-                    possible_routes = all_routes
-
-                    for routes in possible_routes:
-                        if not routes in tippies:
-                            tippies +=  [routes]
-            return tippies
+        >>> TippyGameState('p1').find_tippies()[0]
+        [TippyMove([0, 0]), TippyMove([0, 1]), TippyMove([1, 1]), \
+TippyMove([1, 2])]
+        """
+
+        return [list(tippy) for tippy in TippyGeometry(self.n).tippies]
 
-    
     def left(self, coord):
         """(TippyGameState, list of int) -> list of int
 
@@ -438,6 +930,7 @@ if __name__ == '__main__':
     from strategy_minimax_memoize import StrategyMinimaxMemoize
     from strategy_minimax_prune import StrategyMinimaxPrune
     from strategy_minimax import StrategyMinimax    
+    import time
     import doctest
     doctest.testmod()
     
@@ -72,10 +72,6 @@ class TippyGameState(GameState):
         
         self.player_to_move = player_to_move
         
-        if self.all_tippies is not None:
-            if not self.possible_next_moves():
-                self.over = True
-        
     def __repr__(self):
         """(TippyGameState) -> str
 
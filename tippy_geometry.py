@@ -0,0 +1,235 @@
+from tippy_move import TippyMove
+
+
+class TippyGeometry:
+    """ Everything about an n x n Tippy board that does not depend on the
+    pieces on it.
+
+    There is one TippyGeometry for each board size: TippyGeometry(n)
+    always returns the same object, and that object is never changed, so
+    states of a game can all share it and compare it by identity.
+
+    Squares are written as (x, y), and square (x, y) is bit y * n + x of
+    a mask.
+
+    n: int -- size of the board
+    tippies: tuple of tuple of TippyMove -- the squares of each tippy,
+                                            in the order found by
+                                            TippyGameState.find_tippies
+    tippy_squares: tuple of tuple of (int, int) -- the squares of each
+                                                   tippy
+    masks: tuple of int -- the squares of each tippy, as a mask
+    square_tippies: dict of {(int, int): tuple of int} -- indexes of the
+                                                          tippies through
+                                                          each square
+    neighbours: dict of {(int, int): dict of {str: (int, int)}}
+                -- the square up, down, left and right of each square,
+                   where there is one
+    symmetries: tuple of tuple of int -- for each of the 8 rotations and
+                                         reflections of the board, the
+                                         bit each bit of a mask moves to
+    """
+
+    # the geometry of each board size made so far
+    _sizes = {}
+    # where each step of neighbours leads, as (dx, dy)
+    STEPS = {'up': (0, -1), 'down': (0, 1), 'left': (-1, 0), 'right': (1, 0)}
+    # the steps from one square of a tippy to the next three
+    ROUTES = (('up', 'right', 'up'), ('up', 'left', 'up'),
+              ('down', 'right', 'down'), ('down', 'left', 'down'),
+              ('right', 'up', 'right'), ('right', 'down', 'right'),
+              ('left', 'up', 'left'), ('left', 'down', 'left'))
+
+    def __new__(cls, n):
+        """(TippyGeometry.__class__, int) -> TippyGeometry
+
+        Return the geometry of an n x n board, making it the first time
+        it is asked for.
+
+        >>> TippyGeometry(3) is TippyGeometry(3)
+        True
+        """
+
+        geometry = cls._sizes.get(n)
+        if geometry is None:
+            geometry = object.__new__(cls)
+            geometry._build(n)
+            cls._sizes[n] = geometry
+        return geometry
+
+    def _build(self, n):
+        """(TippyGeometry, int) -> NoneType
+
+        Work out the tables of an n x n board.
+
+        >>> geometry = TippyGeometry(3)
+        >>> len(geometry.tippies)
+        8
+        >>> geometry.neighbours[(0, 0)] == {'down': (0, 1), 'right': (1, 0)}
+        True
+        >>> geometry.square_tippies[(0, 0)]
+        (0, 1)
+        >>> bin(geometry.masks[0])
+        '0b10011001'
+        """
+
+        squares = [(x, y) for y in range(n) for x in range(n)]
+        neighbours = {}
+        for x, y in squares:
+            neighbours[(x, y)] = {}
+            for step, (dx, dy) in TippyGeometry.STEPS.items():
+                if 0 <= x + dx < n and 0 <= y + dy < n:
+                    neighbours[(x, y)][step] = (x + dx, y + dy)
+
+        # Squares in the order TippyGameState.find_tippies visits them,
+        # which is by column, then row.
+        tippy_squares = []
+        for square in sorted(squares):
+            for route in TippyGeometry._routes(neighbours, square):
+                if route not in tippy_squares:
+                    tippy_squares.append(route)
+
+        square_tippies = {}
+        for square in squares:
+            square_tippies[square] = tuple(
+                i for i in range(len(tippy_squares))
+                if square in tippy_squares[i])
+
+        symmetries = []
+        for flip in (False, True):
+            for turns in range(4):
+                bits = []
+                for x, y in squares:
+                    if flip:
+                        x = n - 1 - x
+                    for turn in range(turns):
+                        x, y = n - 1 - y, x
+                    bits.append(y * n + x)
+                symmetries.append(tuple(bits))
+
+        set_attribute = object.__setattr__
+        set_attribute(self, 'n', n)
+        set_attribute(self, 'tippy_squares', tuple(tippy_squares))
+        set_attribute(self, 'tippies', tuple(
+            tuple(TippyMove(list(square)) for square in route)
+            for route in tippy_squares))
+        set_attribute(self, 'masks', tuple(
+            sum(1 << (y * n + x) for x, y in route)
+            for route in tippy_squares))
+        set_attribute(self, 'square_tippies', square_tippies)
+        set_attribute(self, 'neighbours', neighbours)
+        set_attribute(self, 'symmetries', tuple(symmetries))
+
+    @staticmethod
+    def _routes(neighbours, square):
+        """(dict of {(int, int): dict of {str: (int, int)}}, (int, int))
+                                             -> list of tuple of (int, int)
+
+        Return the tippies starting from square, following each of
+        TippyGeometry.ROUTES on the board described by neighbours, with
+        the squares of each in sorted order.
+        """
+
+        routes = []
+        for route in TippyGeometry.ROUTES:
+            squares = [square]
+            for step in route:
+                squares.append(neighbours[squares[-1]].get(step))
+                if squares[-1] is None:
+                    break
+            else:
+                routes.append(tuple(sorted(squares)))
+        return routes
+
+    def __setattr__(self, name, value):
+        """(TippyGeometry, str, object) -> NoneType
+
+        Refuse to change self, which is shared by every state of its
+        board size.
+
+        >>> TippyGeometry(3).n = 4
+        Traceback (most recent call last):
+        ...
+        AttributeError: TippyGeometry is shared and cannot be changed
+        """
+
+        raise AttributeError('TippyGeometry is shared and cannot be changed')
+
+    def __repr__(self):
+        """(TippyGeometry) -> str
+
+        Return a string representation of self that evaluates to self.
+
+        >>> TippyGeometry(4)
+        TippyGeometry(4)
+        """
+
+        return 'TippyGeometry({})'.format(self.n)
+
+    def __reduce__(self):
+        """(TippyGeometry) -> tuple
+
+        Pickle self as its board size only, so that unpickling finds the
+        geometry already made for that size.
+
+        >>> import pickle
+        >>> pickle.loads(pickle.dumps(TippyGeometry(3))) is TippyGeometry(3)
+        True
+        """
+
+        return (TippyGeometry, (self.n,))
+
+    def mask(self, moves):
+        """(TippyGeometry, list of TippyMove) -> int
+
+        Return the squares of moves as a mask.
+
+        >>> TippyGeometry(3).mask([TippyMove([1, 0]), TippyMove([0, 2])])
+        66
+        """
+
+        return sum(1 << (move.move[1] * self.n + move.move[0])
+                   for move in moves)
+
+    def any_tippy(self, mask):
+        """(TippyGeometry, int) -> bool
+
+        Return whether the squares in mask include a whole tippy.
+
+        >>> geometry = TippyGeometry(3)
+        >>> geometry.any_tippy(0b10011001)
+        True
+        >>> geometry.any_tippy(0b11011)
+        False
+        """
+
+        for tippy in self.masks:
+            if mask & tippy == tippy:
+                return True
+        return False
+
+    def transform(self, mask, symmetry):
+        """(TippyGeometry, int, int) -> int
+
+        Return mask rotated or reflected by self.symmetries[symmetry].
+        Tippies are carried to tippies by every symmetry.
+
+        >>> geometry = TippyGeometry(3)
+        >>> [geometry.transform(0b1, i) for i in range(8)]
+        [1, 4, 256, 64, 4, 256, 64, 1]
+        >>> turned = [geometry.transform(m, 1) for m in geometry.masks]
+        >>> sorted(turned) == sorted(geometry.masks)
+        True
+        """
+
+        bits = self.symmetries[symmetry]
+        result = 0
+        for bit in range(self.n * self.n):
+            if mask >> bit & 1:
+                result |= 1 << bits[bit]
+        return result
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,5 +1,4 @@
 from move import Move
-import pep8
 
 
 class TippyMove(Move):
@@ -54,6 +53,7 @@ class TippyMove(Move):
                 self.move == other.move)
 
 if __name__ == '__main__':
+    import pep8
     pep8.Checker('tippy_move.py', ignore=('W2', 'W3')).check_all()
     import doctest
     doctest.testmod()
\ No newline at end of file
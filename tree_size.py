@@ -0,0 +1,93 @@
+import random
+
+# How big the game tree below a position is, found exactly for small
+# trees and estimated for large ones, to judge a solve before starting it.
+
+
+def perft(state, depth, search=False):
+    """(GameState, int, bool) -> list of (int, int)
+
+    Return, for each number of moves from 1 to depth, the number of
+    different sequences of that many moves from state and the number of
+    different positions they reach.  Positions where the game is over are
+    not moved on from.  If search, only search_moves are followed instead
+    of every legal move.
+
+    Positions are merged by to_bytes as they are reached, so each is
+    moved on from once however many sequences reach it.
+
+    >>> from tippy_game_state import TippyGameState
+    >>> perft(TippyGameState('p1'), 3)
+    [(9, 9), (72, 72), (504, 252)]
+    >>> from subtract_square_state import SubtractSquareState
+    >>> perft(SubtractSquareState('p1', current_total=10), 2)
+    [(3, 3), (6, 4)]
+    """
+
+    counts = []
+    # The positions reached by the last number of moves, each with the
+    # number of sequences reaching it.
+    level = {state.to_bytes(): (state, 1)}
+    for ply in range(depth):
+        following = {}
+        for position, paths in level.values():
+            if search:
+                moves = position.search_moves()
+            else:
+                moves = position.possible_next_moves()
+            for move in moves:
+                child = position.apply_move(move)
+                key = child.to_bytes()
+                if key in following:
+                    following[key] = (following[key][0],
+                                      following[key][1] + paths)
+                else:
+                    following[key] = (child, paths)
+        level = following
+        counts.append((sum(paths for position, paths in level.values()),
+                       len(level)))
+    return counts
+
+
+def knuth_estimate(state, probes=100, search=False, rng=random):
+    """(GameState, int, bool, Random) -> float
+
+    Return an estimate of the number of positions in the game tree below
+    and including state, by Knuth's method: follow probes random lines of
+    play to the end of the game, and average, over the lines, the sum for
+    each position on the line of the product of the numbers of moves from
+    the positions before it.  The average tends to the size of the tree
+    as probes grows.  If search, only search_moves are followed.
+
+    >>> from subtract_square_state import SubtractSquareState
+    >>> knuth_estimate(SubtractSquareState('p1', current_total=3))
+    4.0
+    >>> from tippy_game_state import TippyGameState
+    >>> 1 + sum(paths for paths, positions in perft(TippyGameState('p1'), 9))
+    917290
+    >>> estimate = knuth_estimate(TippyGameState('p1'), 1000,
+    ...                           rng=random.Random(0))
+    >>> round(estimate, -4)
+    920000.0
+    """
+
+    total = 0.0
+    for probe in range(probes):
+        position, width, size = state, 1.0, 1.0
+        while True:
+            if search:
+                moves = position.search_moves()
+            else:
+                moves = position.possible_next_moves()
+            if not moves:
+                break
+            width *= len(moves)
+            size += width
+            position = position.apply_move(rng.choice(moves))
+        total += size
+    return total / probes
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()